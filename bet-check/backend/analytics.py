@@ -0,0 +1,213 @@
+"""
+Incremental accuracy analytics.
+
+Keeps running total/correct tallies per sport, confidence bucket and factor,
+bucketed by day, so /analytics never scans the predictions or results
+tables. Tallies are updated when a result is logged or verified and can be
+rebuilt from history in one pass at startup.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+# Supported /analytics windows (days of history, None = all time)
+WINDOWS = {"7d": 7, "30d": 30, "all": None}
+
+# Lower bounds of the confidence buckets (confidence is 50-100)
+CONFIDENCE_BUCKETS = (50, 60, 70, 80, 90)
+
+
+def confidence_bucket(confidence: float) -> str:
+    """Label such as "60-70" for a confidence percentage"""
+    lower = max((b for b in CONFIDENCE_BUCKETS if confidence >= b), default=CONFIDENCE_BUCKETS[0])
+    return f"{lower}-{lower + 10}"
+
+
+def _empty_tally() -> Dict[str, int]:
+    return {"total": 0, "correct": 0}
+
+
+def _summary(tally: Dict[str, int]) -> dict:
+    total, correct = tally["total"], tally["correct"]
+    return {
+        "total": total,
+        "correct": correct,
+        "accuracy": round(correct / total * 100, 2) if total else 0.0,
+    }
+
+
+class _Slice:
+    """Tallies for one (day, sport) cell"""
+
+    __slots__ = ("tally", "buckets", "factors")
+
+    def __init__(self):
+        self.tally = _empty_tally()
+        self.buckets: Dict[str, Dict[str, int]] = {}
+        self.factors: Dict[str, Dict[str, int]] = {}
+
+
+class AccuracyAggregates:
+    """
+    Running accuracy tallies.
+
+    All-time tallies are kept per sport; windowed tallies are kept per
+    (day, sport) for the longest window only. A query touches at most
+    30 days x sports cells, independent of how many predictions exist.
+
+    Each game is counted once; recording it again (e.g. a corrected result)
+    replaces its earlier contribution. `version` increases on every change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self._all_time: Dict[str, _Slice] = {}
+        self._daily: Dict[date, Dict[str, _Slice]] = {}
+        self._scored: Dict[str, dict] = {}
+        self._max_days = max(d for d in WINDOWS.values() if d)
+
+    def _apply(self, entry: dict, sign: int) -> None:
+        cells = [self._all_time.setdefault(entry["sport"], _Slice())]
+        if entry["day"] in self._daily or sign > 0:
+            cells.append(self._daily.setdefault(entry["day"], {}).setdefault(entry["sport"], _Slice()))
+
+        correct = sign if entry["was_correct"] else 0
+        for cell in cells:
+            tallies = [cell.tally]
+            if entry["bucket"]:
+                tallies.append(cell.buckets.setdefault(entry["bucket"], _empty_tally()))
+            tallies.extend(cell.factors.setdefault(name, _empty_tally()) for name in entry["factors"])
+            for tally in tallies:
+                tally["total"] += sign
+                tally["correct"] += correct
+
+    def _prune(self, today: date) -> None:
+        cutoff = today - timedelta(days=self._max_days)
+        for day in [d for d in self._daily if d <= cutoff]:
+            del self._daily[day]
+
+    def record(
+        self,
+        game_id: str,
+        sport: str,
+        was_correct: bool,
+        confidence: Optional[float] = None,
+        factors: Iterable[str] = (),
+        when: Optional[datetime] = None
+    ) -> None:
+        """
+        Count a scored prediction.
+
+        Args:
+            game_id: Game identifier (each game is counted once)
+            sport: Sport code
+            was_correct: Whether the prediction matched the result
+            confidence: Prediction confidence (0-100), if known
+            factors: Names of factors that favored the predicted team
+            when: When the result was scored (defaults to now, UTC)
+        """
+        entry = {
+            "sport": (sport or "unknown").lower(),
+            "was_correct": bool(was_correct),
+            "bucket": confidence_bucket(float(confidence)) if confidence is not None else None,
+            "factors": tuple(factors),
+            "day": (when or datetime.utcnow()).date(),
+        }
+        with self._lock:
+            previous = self._scored.get(game_id)
+            if previous:
+                self._apply(previous, -1)
+            self._apply(entry, 1)
+            self._scored[game_id] = entry
+            self._prune(datetime.utcnow().date())
+            self.version += 1
+
+    def rebuild(self, rows: Iterable[dict]) -> int:
+        """
+        Replace all tallies from history in one pass.
+
+        Rows need game_id, sport and was_correct, and may carry confidence,
+        factors and scored_at (datetime or ISO string).
+        """
+        fresh = AccuracyAggregates()
+        count = 0
+        for row in rows:
+            scored_at = row.get("scored_at")
+            if isinstance(scored_at, str):
+                scored_at = datetime.fromisoformat(scored_at.replace("Z", "+00:00")).replace(tzinfo=None)
+            fresh.record(
+                row["game_id"],
+                row.get("sport"),
+                row["was_correct"],
+                confidence=row.get("confidence"),
+                factors=row.get("factors", ()),
+                when=scored_at
+            )
+            count += 1
+
+        with self._lock:
+            self._all_time = fresh._all_time
+            self._daily = fresh._daily
+            self._scored = fresh._scored
+            self.version += 1
+        return count
+
+    def summary(self, sport: Optional[str] = None, window: str = "all") -> dict:
+        """
+        Accuracy totals with per-sport, per-confidence-bucket and per-factor breakdowns.
+
+        Raises:
+            ValueError: Unknown window
+        """
+        if window not in WINDOWS:
+            raise ValueError(f"window must be one of {', '.join(WINDOWS)}")
+
+        with self._lock:
+            days = WINDOWS[window]
+            if days is None:
+                cells = [(s, c) for s, c in self._all_time.items()]
+            else:
+                since = datetime.utcnow().date() - timedelta(days=days - 1)
+                cells = [
+                    (s, c)
+                    for day, by_sport in self._daily.items() if day >= since
+                    for s, c in by_sport.items()
+                ]
+            if sport:
+                cells = [(s, c) for s, c in cells if s == sport.lower()]
+
+            overall = _empty_tally()
+            by_sport: Dict[str, Dict[str, int]] = {}
+            by_bucket: Dict[str, Dict[str, int]] = {}
+            by_factor: Dict[str, Dict[str, int]] = {}
+            for cell_sport, cell in cells:
+                self._add(overall, cell.tally)
+                self._add(by_sport.setdefault(cell_sport, _empty_tally()), cell.tally)
+                for bucket, tally in cell.buckets.items():
+                    self._add(by_bucket.setdefault(bucket, _empty_tally()), tally)
+                for name, tally in cell.factors.items():
+                    self._add(by_factor.setdefault(name, _empty_tally()), tally)
+
+            return {
+                **_summary(overall),
+                "by_sport": {k: _summary(v) for k, v in sorted(by_sport.items())},
+                "by_confidence": {k: _summary(v) for k, v in sorted(by_bucket.items())},
+                "by_factor": {k: _summary(v) for k, v in sorted(by_factor.items())},
+            }
+
+    @staticmethod
+    def _add(into: Dict[str, int], tally: Dict[str, int]) -> None:
+        into["total"] += tally["total"]
+        into["correct"] += tally["correct"]
+
+
+def favoring_factors(factor_contributions: dict, predicted_team_a: bool) -> List[str]:
+    """Names of factors whose contribution favored the predicted team"""
+    side, other = ("team_a", "team_b") if predicted_team_a else ("team_b", "team_a")
+    return [name for name, c in factor_contributions.items() if c[side] > c[other]]
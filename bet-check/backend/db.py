@@ -7,14 +7,37 @@ https://jmenichole.github.io/Portfolio/
 """
 
 import os
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from game_store import day_after
+from game_sync import sync_games
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# Primary key of each table, used to order paged scans
+PRIMARY_KEYS = {
+    "games": "game_id",
+    "factors": "factor_id",
+    "predictions": "prediction_id",
+    "prediction_factor_contributions": "id",
+    "results": "result_id",
+}
+
+# PostgREST / Postgres error codes meaning the adjust_factor_weights() function
+# is not installed (as opposed to a transient failure)
+MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+WEIGHT_RPC_ATTEMPTS = 3
+
 def get_supabase_client() -> Client:
     """Initialize and return Supabase client"""
     return create_client(SUPABASE_URL, SUPABASE_KEY)
@@ -28,3 +51,388 @@ def verify_connection() -> bool:
     except Exception as e:
         print(f"Connection error: {str(e)}")
         return False
+
+
+class SupabaseRepository:
+    """
+    Data access for games, factors, predictions and results.
+
+    Every method is a plain blocking call; wrap the repository in an
+    AsyncRepository before using it from request handlers.
+    """
+
+    # Games are written by scripts/update_games.py, not by the API
+    syncs_live_games = False
+
+    def __init__(self, client: Client):
+        self.client = client
+        self._weight_rpc_available = True  # Cleared if adjust_factor_weights() is not installed
+
+    # ---------- Games ----------
+
+    def get_game(self, game_id: str) -> Optional[dict]:
+        response = self.client.table("games").select("*").eq("game_id", game_id).execute()
+        return response.data[0] if response.data else None
+
+    def get_games(self, game_ids: List[str]) -> List[dict]:
+        return self.client.table("games").select("*").in_("game_id", game_ids).execute().data
+
+    def list_games(self, sport: Optional[str] = None) -> List[dict]:
+        """Every upcoming game, in the same order as list_games_page()"""
+        query = self.client.table("games").select("*").is_("result", "null")
+        if sport:
+            query = query.eq("sport", sport.lower())
+        return query.order("scheduled_date").order("game_id").execute().data
+
+    def list_games_page(
+        self,
+        sport: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 100
+    ) -> List[dict]:
+        """
+        Upcoming games ordered by (scheduled_date, game_id), starting after a
+        keyset cursor, within [date_from, date_to] (inclusive days).
+        Served by idx_games_scheduled; cost does not grow with the page number.
+        """
+        query = self.client.table("games").select("*").is_("result", "null")
+        if sport:
+            query = query.eq("sport", sport.lower())
+        if date_from:
+            query = query.gte("scheduled_date", date_from)
+        if date_to:
+            query = query.lt("scheduled_date", day_after(date_to))
+        if after:
+            scheduled_date, game_id = after
+            query = query.or_(
+                f'scheduled_date.gt."{scheduled_date}",'
+                f'and(scheduled_date.eq."{scheduled_date}",game_id.gt."{game_id}")'
+            )
+        return query.order("scheduled_date").order("game_id").limit(limit).execute().data
+
+    def upsert_games(self, games: List[dict]) -> None:
+        """Write only new or changed games (diff-aware bulk upsert)"""
+        sync_games(self.client, games)
+
+    def merge_games(self, merges: Dict[str, str]) -> None:
+        """
+        Move predictions and results from duplicate game_ids onto their
+        canonical id ({duplicate: canonical}), then delete the duplicates.
+        The canonical rows must already exist.
+
+        Uses the merge_games SQL function (one transaction) when installed.
+        Otherwise each step leaves the tables consistent, like the SQLite
+        version: a duplicate's predictions for a weight_version the canonical
+        game already has are deleted (with their contributions) before the
+        rest are moved, so the (game_id, weight_version) index never breaks.
+        """
+        if not merges:
+            return
+        try:
+            self.client.rpc("merge_games", {"merges": merges}).execute()
+            return
+        except Exception as e:
+            if getattr(e, "code", None) not in MISSING_FUNCTION_CODES:
+                raise
+            print(f"⚠ merge_games not installed, merging step by step: {e}")
+
+        by_target: Dict[str, List[str]] = {}
+        for old, new in merges.items():
+            by_target.setdefault(new, []).append(old)
+        for new, olds in by_target.items():
+            rows = self.client.table("predictions").select("prediction_id,game_id,weight_version").in_(
+                "game_id", [new, *olds]
+            ).execute().data
+            # Canonical game's predictions first, then the oldest duplicate's
+            rows.sort(key=lambda r: (r["game_id"] != new, r["prediction_id"]))
+            kept: Dict[str, int] = {}
+            dropped = [
+                r["prediction_id"] for r in rows
+                if kept.setdefault(r["weight_version"], r["prediction_id"]) != r["prediction_id"]
+            ]
+            if dropped:
+                self.client.table("prediction_factor_contributions").delete().in_("prediction_id", dropped).execute()
+                self.client.table("predictions").delete().in_("prediction_id", dropped).execute()
+            for table in ("predictions", "results"):
+                self.client.table(table).update({"game_id": new}).in_("game_id", olds).execute()
+            self.client.table("games").delete().in_("game_id", olds).execute()
+
+    # ---------- Factors ----------
+
+    def list_factors(self) -> List[dict]:
+        return self.client.table("factors").select("*").execute().data
+
+    def adjust_factor_weights(self, factor_ids: List[int], delta: float) -> Dict[int, float]:
+        """
+        Shift the given factors' weights by delta, clamped to their min/max.
+
+        Prefers the adjust_factor_weights SQL function (atomic, one round trip);
+        falls back to one read plus one bulk upsert only if it is not
+        installed. Other RPC errors are retried, then raised.
+        """
+        if self._weight_rpc_available:
+            for attempt in range(WEIGHT_RPC_ATTEMPTS):
+                try:
+                    response = self.client.rpc("adjust_factor_weights", {
+                        "factor_ids": factor_ids,
+                        "delta": delta
+                    }).execute()
+                    return {row["factor_id"]: float(row["current_weight"]) for row in response.data}
+                except Exception as e:
+                    if getattr(e, "code", None) in MISSING_FUNCTION_CODES:
+                        print(f"⚠ adjust_factor_weights not installed, using bulk upsert: {e}")
+                        self._weight_rpc_available = False
+                        break
+                    # Transient failure: retry the atomic update rather than
+                    # falling back to a read-modify-write
+                    if attempt == WEIGHT_RPC_ATTEMPTS - 1:
+                        raise
+                    print(f"⚠ adjust_factor_weights failed, retrying: {e}")
+                    time.sleep(0.2 * 2 ** attempt)
+
+        factors = self.client.table("factors").select("*").in_("factor_id", factor_ids).execute().data
+        new_weights = {
+            f["factor_id"]: round(min(float(f["max_weight"]), max(float(f["min_weight"]), float(f["current_weight"]) + delta)), 4)
+            for f in factors
+        }
+        if factors:
+            now = datetime.utcnow().isoformat()
+            self.client.table("factors").upsert([
+                {**f, "current_weight": new_weights[f["factor_id"]], "updated_at": now}
+                for f in factors
+            ], on_conflict="factor_id").execute()
+        return new_weights
+
+    def apply_weight_deltas(self, deltas: Dict[int, float]) -> Dict[int, float]:
+        """
+        Shift each factor's weight by its own delta, clamped to its min/max.
+
+        Factors sharing a delta are shifted together, so this is one atomic
+        adjust_factor_weights() call per distinct delta (one in the usual
+        case, where every factor earned the same adjustment).
+        """
+        groups: Dict[float, List[int]] = {}
+        for factor_id, delta in deltas.items():
+            groups.setdefault(delta, []).append(factor_id)
+
+        new_weights = {}
+        for delta, factor_ids in groups.items():
+            new_weights.update(self.adjust_factor_weights(factor_ids, delta))
+        return new_weights
+
+    def set_factor_weights(self, weights: Dict[int, float]) -> None:
+        """Replace current weights in one bulk upsert (e.g. after offline training)"""
+        factors = self.client.table("factors").select("*").in_("factor_id", list(weights)).execute().data
+        if factors:
+            now = datetime.utcnow().isoformat()
+            self.client.table("factors").upsert([
+                {**f, "current_weight": weights[f["factor_id"]], "updated_at": now}
+                for f in factors
+            ], on_conflict="factor_id").execute()
+
+    # ---------- Predictions ----------
+
+    def save_predictions(self, items: List[dict]) -> None:
+        """
+        Write predictions with their factor contributions.
+
+        Each item is {"prediction": row, "contributions": {factor_id: value},
+        "weights": {factor_id: weight used}}. Predictions are upserted on
+        (game_id, weight_version); contributions of the returned prediction
+        ids are replaced, so re-saving a prediction never duplicates them.
+        Three round trips per batch.
+        """
+        if not items:
+            return
+        # Postgres rejects an upsert that touches the same key twice, so keep
+        # the last item per (game_id, weight_version)
+        items = list({
+            (item["prediction"]["game_id"], item["prediction"]["weight_version"]): item for item in items
+        }.values())
+        saved = self.client.table("predictions").upsert(
+            [item["prediction"] for item in items], on_conflict="game_id,weight_version"
+        ).execute().data
+        ids = {(r["game_id"], r["weight_version"]): r["prediction_id"] for r in saved}
+
+        contributions = []
+        for item in items:
+            row = item["prediction"]
+            prediction_id = ids.get((row["game_id"], row["weight_version"]))
+            if prediction_id is None:
+                continue
+            weights = item.get("weights", {})
+            contributions.extend(
+                {
+                    "prediction_id": prediction_id,
+                    "factor_id": factor_id,
+                    "contribution_value": value,
+                    "factor_weight": weights.get(factor_id)
+                }
+                for factor_id, value in item["contributions"].items()
+            )
+        if contributions:
+            self.client.table("prediction_factor_contributions").delete().in_(
+                "prediction_id", list(ids.values())
+            ).execute()
+            self.client.table("prediction_factor_contributions").insert(contributions).execute()
+
+    def find_prediction(self, game_id: str) -> Optional[dict]:
+        """Most recent prediction for a game"""
+        response = self.client.table("predictions").select("*").eq(
+            "game_id", game_id
+        ).order("created_at", desc=True).limit(1).execute()
+        return response.data[0] if response.data else None
+
+    def mark_prediction_result(self, game_id: str, was_correct: bool, verification_type: str) -> None:
+        self.client.table("predictions").update({
+            "result_verified": True,
+            "was_correct": was_correct,
+            "verification_type": verification_type,
+            "updated_at": datetime.utcnow().isoformat()
+        }).eq("game_id", game_id).execute()
+
+    def list_scored_predictions(self, chunk_size: int = 500) -> List[dict]:
+        """Verified predictions with their game's sport and favoring factors, for rebuilding analytics"""
+        rows = [
+            r for page in self._paged(lambda: self.client.table("predictions").select(
+                "prediction_id,game_id,confidence,was_correct,created_at,updated_at"
+            ).eq("result_verified", True).order("prediction_id"))
+            for r in page
+        ]
+
+        game_ids = list({r["game_id"] for r in rows})
+        sports = {}
+        for start in range(0, len(game_ids), chunk_size):
+            response = self.client.table("games").select("game_id,sport").in_(
+                "game_id", game_ids[start:start + chunk_size]
+            ).execute()
+            sports.update({g["game_id"]: g["sport"] for g in response.data})
+
+        names = {f["factor_id"]: f["name"] for f in self.list_factors()}
+        prediction_ids = [r["prediction_id"] for r in rows]
+        favoring: Dict[int, List[str]] = {}
+        for start in range(0, len(prediction_ids), chunk_size):
+            chunk = prediction_ids[start:start + chunk_size]
+            for page in self._paged(lambda: self.client.table("prediction_factor_contributions").select(
+                "prediction_id,factor_id"
+            ).in_("prediction_id", chunk).gt("contribution_value", 0).order("id")):
+                for c in page:
+                    favoring.setdefault(c["prediction_id"], []).append(names.get(c["factor_id"]))
+
+        return [
+            {
+                **r,
+                "sport": sports.get(r["game_id"]),
+                "scored_at": r.get("updated_at") or r.get("created_at"),
+                "factors": [n for n in favoring.get(r["prediction_id"], []) if n],
+            }
+            for r in rows
+        ]
+
+    def favoring_factor_names(self, prediction_id: int) -> List[str]:
+        """Factors whose stored contribution favored the predicted team"""
+        names = {f["factor_id"]: f["name"] for f in self.list_factors()}
+        response = self.client.table("prediction_factor_contributions").select("factor_id").eq(
+            "prediction_id", prediction_id
+        ).gt("contribution_value", 0).order("id").execute()
+        return [names[c["factor_id"]] for c in response.data if c["factor_id"] in names]
+
+    def contribution_factor_ids(self, prediction_id: int) -> List[int]:
+        response = self.client.table("prediction_factor_contributions").select("factor_id").eq(
+            "prediction_id", prediction_id
+        ).execute()
+        return sorted({c["factor_id"] for c in response.data})
+
+    # ---------- Results ----------
+
+    def insert_result(self, game_id: str, actual_outcome: str, verification_type: str) -> None:
+        self.client.table("results").insert({
+            "game_id": game_id,
+            "actual_outcome": actual_outcome,
+            "verification_type": verification_type,
+            "created_at": datetime.utcnow().isoformat()
+        }).execute()
+
+    def insert_results(self, results: List[dict], chunk_size: int = 500) -> int:
+        """
+        Bulk insert results (game_id, actual_outcome, verification_type),
+        skipping games that already have a result. Returns the number inserted.
+        """
+        now = datetime.utcnow().isoformat()
+        rows = {r["game_id"]: r for r in results}
+        inserted = 0
+        game_ids = list(rows)
+        for start in range(0, len(game_ids), chunk_size):
+            chunk = game_ids[start:start + chunk_size]
+            existing = self.client.table("results").select("game_id").in_("game_id", chunk).execute()
+            stored = {r["game_id"] for r in existing.data}
+            new = [
+                {
+                    "game_id": gid,
+                    "actual_outcome": rows[gid]["actual_outcome"],
+                    "verification_type": rows[gid].get("verification_type"),
+                    "created_at": now
+                }
+                for gid in chunk if gid not in stored
+            ]
+            if new:
+                self.client.table("results").insert(new).execute()
+                inserted += len(new)
+        return inserted
+
+    def latest_verification_type(self, game_id: str) -> Optional[str]:
+        response = self.client.table("results").select("verification_type").eq(
+            "game_id", game_id
+        ).order("created_at", desc=True).limit(1).execute()
+        return response.data[0].get("verification_type", "auto") if response.data else None
+
+    # ---------- Bulk reads ----------
+
+    def _paged(self, query: Callable, page_size: int = 1000) -> Iterator[List[dict]]:
+        """
+        Yield the rows of an ordered query in pages. PostgREST caps rows per
+        response, so large reads use range paging; `query` builds a fresh
+        query builder for each page.
+        """
+        start = 0
+        while True:
+            page = query().range(start, start + page_size - 1).execute().data
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            start += page_size
+
+    def scan(self, table: str, columns: str = "*", page_size: int = 1000) -> Iterator[List[dict]]:
+        """Yield every row of a table in pages ordered by primary key"""
+        key = PRIMARY_KEYS[table]
+        return self._paged(lambda: self.client.table(table).select(columns).order(key), page_size)
+
+
+class AsyncRepository:
+    """
+    Async facade that runs repository calls on a bounded thread pool.
+
+    Attribute access returns an awaitable version of the wrapped method, so
+    `await db.get_game(game_id)` never blocks the event loop. Use `run()` for
+    any other blocking callable (e.g. the LearningQueue's calls to
+    PredictionEngine.apply_weight_deltas).
+    """
+
+    def __init__(self, repository, max_workers: int = 16):
+        self._repository = repository
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+
+    async def run(self, func: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        method = getattr(self._repository, name)
+
+        async def call(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+
+        return call
@@ -0,0 +1,204 @@
+"""
+Async ESPN scoreboard client shared by the backend and scripts.
+
+Uses one pooled keep-alive httpx connection and fetches every (sport, date)
+scoreboard concurrently, bounded by a semaphore, so a multi-day multi-sport
+sync takes about as long as the slowest single request.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from metrics import ESPN_FETCH_SECONDS, ESPN_FETCH_FAILURES
+from teams import TEAMS, espn_aliases, game_key
+
+ESPN_BASE_URL = "https://site.api.espn.com/apis/site/v2/sports"
+
+# ESPN sport paths (free API, no key required)
+SPORTS = {
+    "nba": "basketball/nba",
+    "nfl": "football/nfl",
+    # add more later
+}
+
+
+def upcoming_dates(days_ahead: int, start: Optional[datetime] = None) -> List[str]:
+    """Return YYYYMMDD strings for start (default now) and the following days"""
+    start = start or datetime.now()
+    return [(start + timedelta(days=offset)).strftime("%Y%m%d") for offset in range(days_ahead)]
+
+
+def _score(competitor: dict) -> Optional[int]:
+    try:
+        return int(competitor.get("score"))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_event(event: dict, sport: str) -> Optional[dict]:
+    """
+    Normalize an ESPN scoreboard event into a game row.
+
+    team_a is the home team. Teams are interned in the shared registry, so
+    names are canonical and the integer ids ride along (in memory only).
+    Returns None for events without two competitors.
+    """
+    comps = event.get("competitions", [{}])[0]
+    competitors = comps.get("competitors", [])
+    if len(competitors) < 2:
+        return None
+    if competitors[0].get("homeAway") == "away":
+        competitors = [competitors[1], competitors[0]]
+
+    ids = []
+    for competitor in competitors[:2]:
+        team = competitor.get("team", {})
+        ids.append(TEAMS.intern(sport, team.get("displayName", "Unknown"), espn_aliases(team)))
+    winner_id = next((ids[i] for i, c in enumerate(competitors[:2]) if c.get("winner")), None)
+
+    game = {
+        "game_id": game_key(sport, event.get("id")),
+        "sport": sport.lower(),
+        "team_a": TEAMS.name(ids[0]),
+        "team_b": TEAMS.name(ids[1]),
+        "scheduled_date": event.get("date", "")[:10],
+        "result": None
+    }
+    game["team_a_id"], game["team_b_id"] = ids
+    game["start_time"] = event.get("date")  # full ISO start, kept in memory only
+
+    # Live state ("pre", "in" or "post") and scores, kept in memory only
+    status = comps.get("status", {}).get("type", {})
+    game["state"] = status.get("state")
+    if game["state"] in ("in", "post"):
+        game["score_a"] = _score(competitors[0])
+        game["score_b"] = _score(competitors[1])
+
+    # If game completed, set winner
+    if status.get("completed") and winner_id is not None:
+        game["result"] = TEAMS.name(winner_id)
+
+    return game
+
+
+class ESPNClient:
+    """
+    Pooled async client for ESPN scoreboards.
+
+    Use as an async context manager so the connection pool is closed:
+
+        async with ESPNClient() as client:
+            events = await client.fetch_events(["nba", "nfl"], upcoming_dates(8))
+
+    Every request is timed and recorded in `timings`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        timeout: float = 10.0,
+        base_url: str = ESPN_BASE_URL,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timings: List[dict] = []
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency
+            ),
+            transport=transport
+        )
+
+    async def __aenter__(self) -> "ESPNClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def fetch_scoreboard(self, sport: str, dates: str) -> List[dict]:
+        """
+        Fetch raw events for one sport and a `dates` value
+        (YYYYMMDD or a YYYYMMDD-YYYYMMDD range). Failures return [].
+        """
+        url = f"{self.base_url}/{SPORTS[sport]}/scoreboard"
+        timing = {"sport": sport, "dates": dates, "status": None, "elapsed_ms": None, "error": None}
+
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                response = await self._client.get(url, params={"dates": dates})
+                timing["status"] = response.status_code
+                response.raise_for_status()
+                return response.json().get("events", [])
+            except Exception as e:
+                timing["error"] = str(e)
+                ESPN_FETCH_FAILURES.inc(sport=sport)
+                print(f"⚠ ESPN fetch failed ({sport} {dates}): {e}")
+                return []
+            finally:
+                elapsed = time.perf_counter() - started
+                ESPN_FETCH_SECONDS.observe(elapsed, sport=sport)
+                timing["elapsed_ms"] = round(elapsed * 1000, 1)
+                self.timings.append(timing)
+
+    async def fetch_events(
+        self,
+        sports: Optional[Iterable[str]] = None,
+        dates: Iterable[str] = ()
+    ) -> List[Tuple[str, str, dict]]:
+        """
+        Fetch every (sport, date) scoreboard concurrently.
+
+        Returns (sport, date, event) tuples in sport/date order.
+        """
+        requests = [(sport, date) for sport in (sports or SPORTS) for date in dates]
+        results = await asyncio.gather(
+            *(self.fetch_scoreboard(sport, date) for sport, date in requests)
+        )
+        return [
+            (sport, date, event)
+            for (sport, date), events in zip(requests, results)
+            for event in events
+        ]
+
+    async def fetch_games(
+        self,
+        sports: Optional[Iterable[str]] = None,
+        days_ahead: int = 5,
+        start: Optional[datetime] = None
+    ) -> List[dict]:
+        """Fetch and normalize games for the next `days_ahead` days"""
+        games = []
+        for sport, date, event in await self.fetch_events(sports, upcoming_dates(days_ahead, start)):
+            try:
+                game = parse_event(event, sport)
+            except Exception:
+                continue
+            if game:
+                game["scoreboard_date"] = date  # the `dates` value that lists this game
+                games.append(game)
+        return games
+
+    def timing_summary(self) -> Dict[str, float]:
+        """Request count, failures and latency stats (ms) for recorded fetches"""
+        elapsed = [t["elapsed_ms"] for t in self.timings if t["elapsed_ms"] is not None]
+        return {
+            "requests": len(self.timings),
+            "failures": sum(1 for t in self.timings if t["error"]),
+            "max_ms": max(elapsed, default=0.0),
+            "total_ms": round(sum(elapsed), 1),
+        }
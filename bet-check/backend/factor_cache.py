@@ -0,0 +1,112 @@
+"""
+Versioned in-process cache for factor weights.
+
+Factors are read on every prediction but only change when adaptive learning
+runs, so they are kept in memory and reloaded only when the cache is
+invalidated or the TTL expires.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def weights_fingerprint(factors: Dict[int, dict]) -> str:
+    """Short content hash of the current weights, stable across processes"""
+    content = ",".join(
+        f"{fid}:{float(factors[fid]['current_weight']):.6f}" for fid in sorted(factors)
+    )
+    return hashlib.sha1(content.encode()).hexdigest()[:12]
+
+
+class FactorCache:
+    """
+    Caches factor rows keyed by factor_id.
+
+    `version` increases every time the cached weights change (invalidation or
+    a reload that returns different rows), so callers can use it as a key for
+    anything derived from the weights. `fingerprint` is a content hash of the
+    weights that stays the same across restarts and processes.
+    """
+
+    def __init__(self, loader: Callable[[], List[dict]], ttl_seconds: float = 300.0):
+        self._loader = loader
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded = threading.Condition(self._lock)
+        self._loading = False
+        self._factors: Optional[Dict[int, dict]] = None
+        self._loaded_at = float("-inf")
+        self.fingerprint = ""
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self) -> Dict[int, dict]:
+        """Return factors keyed by factor_id, loading them if stale."""
+        return self.snapshot()[0]
+
+    def snapshot(self) -> Tuple[Dict[int, dict], str]:
+        """
+        Return factors and their fingerprint from the same load.
+
+        The loader runs outside the lock, so stats() never waits on a
+        database round trip; concurrent misses wait for the one load in
+        flight instead of each starting their own.
+        """
+        with self._lock:
+            while True:
+                if time.monotonic() - self._loaded_at < self._ttl_seconds:
+                    self.hits += 1
+                    return self._factors, self.fingerprint
+                if not self._loading:
+                    break
+                self._loaded.wait()
+            self.misses += 1
+            self._loading = True
+            version = self.version
+
+        try:
+            factors = {f["factor_id"]: f for f in self._loader()}
+        finally:
+            with self._lock:
+                self._loading = False
+                self._loaded.notify_all()
+
+        fingerprint = weights_fingerprint(factors)
+        with self._lock:
+            # Invalidated while loading: the read may predate the change, so
+            # serve it to this caller but leave the cache stale
+            if self.version != version:
+                return factors, fingerprint
+            if factors != self._factors:
+                self.version += 1
+            self._factors = factors
+            self.fingerprint = fingerprint
+            self._loaded_at = time.monotonic()
+            return factors, fingerprint
+
+    def invalidate(self) -> int:
+        """Mark cached factors stale after weights change and return the new version."""
+        with self._lock:
+            self._loaded_at = float("-inf")
+            self.version += 1
+            return self.version
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "fingerprint": self.fingerprint,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "ttl_seconds": self._ttl_seconds,
+            }
@@ -0,0 +1,147 @@
+"""
+In-process game change notifications.
+
+GameStore reports every game whose status, result, score or verification
+changed; the hub fans each change out to subscribers (one per open
+/games/stream connection). Subscribers are indexed by game and by sport, so
+a change only touches the connections that asked for it.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import asyncio
+import itertools
+import threading
+from typing import Dict, List, Optional, Set
+
+from game_store import game_status
+
+# Fields whose change is worth pushing to clients
+WATCHED_FIELDS = ("result", "verified", "verification_type", "state", "score_a", "score_b", "scheduled_date")
+
+
+def game_event(game: dict) -> dict:
+    """Public payload for a changed game"""
+    return {
+        "game_id": game["game_id"],
+        "sport": game.get("sport"),
+        "team_a": game.get("team_a"),
+        "team_b": game.get("team_b"),
+        "scheduled_date": game.get("scheduled_date"),
+        "status": game_status(game),
+        "state": game.get("state"),
+        "score_a": game.get("score_a"),
+        "score_b": game.get("score_b"),
+        "result": game.get("result"),
+        "verified": bool(game.get("verified")),
+        "verification_type": game.get("verification_type"),
+    }
+
+
+def changed(previous: Optional[dict], game: dict) -> bool:
+    if previous is None:
+        return True
+    return any(previous.get(f) != game.get(f) for f in WATCHED_FIELDS)
+
+
+class Subscription:
+    """One listener's queue. Yields (event_id, payload) pairs."""
+
+    def __init__(self, hub: "GameEventHub", game_id: Optional[str], sport: Optional[str], max_queued: int):
+        self.hub = hub
+        self.game_id = game_id
+        self.sport = sport.lower() if sport else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.loop = asyncio.get_running_loop()
+
+    def _deliver(self, item) -> None:
+        """Runs on the subscriber's loop"""
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Too far behind: drop the backlog and tell the client to refetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait((item[0], {"type": "resync"}))
+
+    async def get(self, timeout: float):
+        """Next (event_id, payload), or None if nothing arrived within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class GameEventHub:
+    """Fan-out of game changes to per-game, per-sport and catch-all subscribers"""
+
+    def __init__(self, max_queued: int = 100):
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._by_game: Dict[str, Set[Subscription]] = {}
+        self._by_sport: Dict[str, Set[Subscription]] = {}
+        self._all: Set[Subscription] = set()
+        self.published = 0
+
+    def subscribe(self, game_id: Optional[str] = None, sport: Optional[str] = None) -> Subscription:
+        """Listen to one game, one sport, or (neither given) every game"""
+        sub = Subscription(self, game_id, sport, self.max_queued)
+        with self._lock:
+            self._bucket(sub).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._bucket(sub).discard(sub)
+            for index, key in ((self._by_game, sub.game_id), (self._by_sport, sub.sport)):
+                if key in index and not index[key]:
+                    del index[key]
+
+    def _bucket(self, sub: Subscription) -> Set[Subscription]:
+        if sub.game_id:
+            return self._by_game.setdefault(sub.game_id, set())
+        if sub.sport:
+            return self._by_sport.setdefault(sub.sport, set())
+        return self._all
+
+    def publish(self, games: List[dict]) -> None:
+        """
+        Push changed games to matching subscribers. Safe to call from any
+        thread; delivery happens on each subscriber's event loop.
+        """
+        for game in games:
+            payload = {"type": "game", **game_event(game)}
+            with self._lock:
+                targets = list(self._by_game.get(game["game_id"], ()))
+                targets.extend(self._by_sport.get((game.get("sport") or "").lower(), ()))
+                targets.extend(self._all)
+                event_id = next(self._ids)
+                self.published += 1
+            for sub in targets:
+                try:
+                    running = asyncio.get_running_loop()
+                except RuntimeError:
+                    running = None
+                if running is sub.loop:
+                    sub._deliver((event_id, payload))
+                elif not sub.loop.is_closed():
+                    sub.loop.call_soon_threadsafe(sub._deliver, (event_id, payload))
+
+    def on_games_changed(self, changes: List[tuple]) -> None:
+        """GameStore listener: (previous, current) pairs"""
+        self.publish([game for previous, game in changes if changed(previous, game)])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._all)
+                + sum(len(s) for s in self._by_game.values())
+                + sum(len(s) for s in self._by_sport.values()),
+                "published": self.published,
+            }
@@ -0,0 +1,356 @@
+"""
+Indexed in-memory game store.
+
+Keeps games in a primary index on game_id plus secondary indexes by sport,
+scheduled date and result status, so lookups and filters do not scan every
+game. All mutations happen under one lock and keep every index consistent.
+
+Games are held as compact `__slots__` records rather than dicts: repeated
+strings (sport, team names, results) are interned, scheduled dates are day
+ordinals and live state is a small int. Callers still get plain dicts back;
+API models are only built from those at the response boundary.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import base64
+import json
+import sys
+import threading
+from datetime import date, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Result status values used by the status index
+SCHEDULED = "scheduled"  # no result yet
+FINAL = "final"          # result recorded, not verified
+VERIFIED = "verified"    # result recorded and verified
+
+
+def game_status(game: dict) -> str:
+    """Classify a game for the status index"""
+    if not game.get("result"):
+        return SCHEDULED
+    return VERIFIED if game.get("verified") else FINAL
+
+
+def game_sort_key(game: dict) -> Tuple[str, str]:
+    """Keyset pagination key: (scheduled_date, game_id)"""
+    return (game.get("scheduled_date") or "", game["game_id"])
+
+
+def encode_cursor(key: Tuple[str, str]) -> str:
+    """Opaque cursor for the row after which the next page starts"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Raises:
+        ValueError: Malformed cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        scheduled_date, game_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(scheduled_date), str(game_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def day_after(day: str) -> str:
+    """YYYY-MM-DD of the next day, used as an exclusive upper bound so `to`
+    includes every scheduled time on that day"""
+    return (date.fromisoformat(day[:10]) + timedelta(days=1)).isoformat()
+
+
+# Live state codes ("pre", "in", "post"); 0 means unknown
+STATE_CODES = {"pre": 1, "in": 2, "post": 3}
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+
+# Optional fields kept in their own slot (omitted from dicts when None)
+OPTIONAL_FIELDS = (
+    "verified", "verification_type", "score_a", "score_b", "start_time",
+    "scoreboard_date", "team_a_id", "team_b_id", "learning_event_id",
+)
+# String fields shared by many games, interned so each value is stored once
+_INTERNED = ("sport", "team_a", "team_b", "result", "verification_type", "start_time", "scoreboard_date")
+_FIXED = ("game_id", "sport", "team_a", "team_b", "scheduled_date", "result", "state") + OPTIONAL_FIELDS
+_optional_values = attrgetter(*OPTIONAL_FIELDS)
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def date_ordinal(value: Optional[str]) -> int:
+    """Day ordinal of a YYYY-MM-DD (or longer ISO) date; 0 if missing or invalid"""
+    if not value:
+        return 0
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+@lru_cache(maxsize=4096)
+def ordinal_date(day: int) -> str:
+    """Inverse of date_ordinal(); strings are shared between games on the same day"""
+    return date.fromordinal(day).isoformat() if day else ""
+
+
+class GameRecord:
+    """
+    One stored game. Fields the store does not know about go in `extra`.
+    """
+
+    __slots__ = ("game_id", "sport", "team_a", "team_b", "day", "result", "state", "extra") + OPTIONAL_FIELDS
+
+    def __init__(self, game: dict):
+        self.game_id = game["game_id"]
+        self.sport = _intern(game.get("sport"))
+        self.team_a = _intern(game.get("team_a"))
+        self.team_b = _intern(game.get("team_b"))
+        self.result = _intern(game.get("result"))
+        for name in OPTIONAL_FIELDS:
+            setattr(self, name, _intern(game.get(name)) if name in _INTERNED else game.get(name))
+
+        extra = {k: v for k, v in game.items() if k not in _FIXED}
+        scheduled = game.get("scheduled_date")
+        self.day = date_ordinal(scheduled)
+        if scheduled != ordinal_date(self.day):
+            extra["scheduled_date"] = scheduled  # keep non-canonical values verbatim
+        state = game.get("state")
+        self.state = STATE_CODES.get(state, 0)
+        if state is not None and not self.state:
+            extra["state"] = state
+        self.extra = extra or None
+
+    @property
+    def scheduled_date(self) -> str:
+        if self.extra and "scheduled_date" in self.extra:
+            return self.extra["scheduled_date"]
+        return ordinal_date(self.day)
+
+    @property
+    def status(self) -> str:
+        if not self.result:
+            return SCHEDULED
+        return VERIFIED if self.verified else FINAL
+
+    def to_dict(self) -> dict:
+        game = {
+            "game_id": self.game_id,
+            "sport": self.sport,
+            "team_a": self.team_a,
+            "team_b": self.team_b,
+            "scheduled_date": ordinal_date(self.day),
+            "result": self.result,
+        }
+        if self.state:
+            game["state"] = STATE_NAMES[self.state]
+        for name, value in zip(OPTIONAL_FIELDS, _optional_values(self)):
+            if value is not None:
+                game[name] = value
+        if self.extra:
+            game.update(self.extra)
+        return game
+
+
+class GameStore:
+    """
+    Thread-safe game store with secondary indexes.
+
+    Games are stored as GameRecords and returned as fresh dicts; change
+    them through `update()` or `upsert()` so the indexes stay in sync.
+    `version` increases on every mutation. Listeners added with `add_listener()` are called after each
+    write (outside the lock) with (previous, current) pairs; previous is
+    None for new games.
+    """
+
+    def __init__(self, games: Iterable[dict] = ()):
+        self._lock = threading.RLock()
+        self.version = 0
+        self._listeners: List[Callable[[List[tuple]], None]] = []
+        self._reset(games)
+
+    def add_listener(self, listener: Callable[[List[tuple]], None]) -> None:
+        self._listeners.append(listener)
+
+    def _notify(self, changes: List[tuple]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(changes)
+            except Exception as e:
+                print(f"⚠ Game store listener failed: {e}")
+
+    def _reset(self, games: Iterable[dict]) -> None:
+        self._games: Dict[str, GameRecord] = {}
+        # dicts used as insertion-ordered sets of game_ids
+        self._by_sport: Dict[str, Dict[str, None]] = {}
+        self._by_date: Dict[int, Dict[str, None]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        for game in games:
+            self._index(GameRecord(game), previous=self._games.get(game["game_id"]))
+
+    # ---------- Index maintenance (caller holds the lock) ----------
+
+    @staticmethod
+    def _keys(record: GameRecord):
+        return ((record.sport or "").lower(), record.day, record.status)
+
+    def _indexes(self):
+        return (self._by_sport, self._by_date, self._by_status)
+
+    def _index(self, record: GameRecord, previous: Optional[GameRecord] = None) -> None:
+        """Store a game, moving it only between secondary buckets whose key changed"""
+        game_id = record.game_id
+        self._games[game_id] = record  # replacing an existing key keeps its position
+        old_keys = self._keys(previous) if previous else (None, None, None)
+        for index, old_key, new_key in zip(self._indexes(), old_keys, self._keys(record)):
+            if old_key == new_key:
+                continue
+            if old_key is not None:
+                self._discard(index, old_key, game_id)
+            index.setdefault(new_key, {})[game_id] = None
+
+    @staticmethod
+    def _discard(index: dict, key, game_id: str) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(game_id, None)
+            if not bucket:
+                del index[key]
+
+    # ---------- Reads ----------
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games
+
+    def get(self, game_id: str) -> Optional[dict]:
+        with self._lock:
+            record = self._games.get(game_id)
+            return record.to_dict() if record else None
+
+    def get_many(self, game_ids: Iterable[str]) -> List[dict]:
+        """Return known games in the order requested"""
+        with self._lock:
+            return [self._games[gid].to_dict() for gid in game_ids if gid in self._games]
+
+    def list(
+        self,
+        sport: Optional[str] = None,
+        date: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[dict]:
+        """
+        List games matching every given filter.
+
+        Args:
+            sport: Sport code (case-insensitive)
+            date: Scheduled date as YYYY-MM-DD
+            status: One of SCHEDULED, FINAL, VERIFIED
+        """
+        with self._lock:
+            buckets = []
+            if sport:
+                buckets.append(self._by_sport.get(sport.lower(), {}))
+            if date:
+                buckets.append(self._by_date.get(date_ordinal(date), {}))
+            if status:
+                buckets.append(self._by_status.get(status, {}))
+
+            if not buckets:
+                return [r.to_dict() for r in self._games.values()]
+
+            # Walk the smallest bucket and check membership in the rest
+            buckets.sort(key=len)
+            smallest, rest = buckets[0], buckets[1:]
+            return [
+                self._games[gid].to_dict()
+                for gid in smallest
+                if all(gid in bucket for bucket in rest)
+            ]
+
+    def page(
+        self,
+        sport: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 100,
+        status: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Games ordered by (scheduled_date, game_id) starting after a keyset
+        cursor, within [date_from, date_to] (inclusive days).
+        """
+        # Compare day ordinals, not date strings; 0 (no date) sorts first like ""
+        lower = date_ordinal(date_from) if date_from else None
+        upper = date_ordinal(day_after(date_to)) if date_to else None
+        after = (date_ordinal(after[0]), after[1]) if after else None
+        with self._lock:
+            candidates = self._by_sport.get(sport.lower(), {}) if sport else self._games
+            if status:
+                in_status = self._by_status.get(status, {})
+                candidates = [gid for gid in candidates if gid in in_status]
+            keys = []
+            for gid in candidates:
+                day = self._games[gid].day
+                if lower is not None and day < lower:
+                    continue
+                if upper is not None and day >= upper:
+                    continue
+                if after and (day, gid) <= after:
+                    continue
+                keys.append((day, gid))
+            keys.sort()
+            return [self._games[gid].to_dict() for _, gid in keys[:limit]]
+
+    # ---------- Writes ----------
+
+    def replace_all(self, games: Iterable[dict]) -> None:
+        """Swap in a new set of games in one step"""
+        fresh = GameStore(games)
+        with self._lock:
+            previous = self._games
+            self._games = fresh._games
+            self._by_sport = fresh._by_sport
+            self._by_date = fresh._by_date
+            self._by_status = fresh._by_status
+            self.version += 1
+        if self._listeners:
+            self._notify([
+                (previous[gid].to_dict() if gid in previous else None, r.to_dict())
+                for gid, r in fresh._games.items()
+            ])
+
+    def upsert(self, game: dict) -> dict:
+        """Insert a game or replace the stored one with the same game_id"""
+        with self._lock:
+            record = GameRecord(game)
+            previous = self._games.get(game["game_id"])
+            self._index(record, previous=previous)
+            self.version += 1
+        current = record.to_dict()
+        self._notify([(previous.to_dict() if previous else None, current)])
+        return dict(current)
+
+    def update(self, game_id: str, **changes) -> Optional[dict]:
+        """Apply field changes to a game; returns the updated copy or None if unknown"""
+        with self._lock:
+            existing = self._games.get(game_id)
+            if not existing:
+                return None
+            before = existing.to_dict()
+            record = GameRecord({**before, **changes, "game_id": game_id})
+            self._index(record, previous=existing)
+            self.version += 1
+        current = record.to_dict()
+        self._notify([(before, current)])
+        return dict(current)
@@ -0,0 +1,100 @@
+"""
+Bulk, diff-aware game upserts.
+
+Incoming games are hashed per game_id and compared against the stored rows,
+so a sync only writes games that are new or changed, in chunked bulk upserts.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+# Columns owned by the fetchers; anything else on the row is left alone
+SYNC_COLUMNS = ("game_id", "sport", "team_a", "team_b", "scheduled_date", "result")
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _normalize_date(value) -> str:
+    """Render dates the way a TIMESTAMP column returns them (naive ISO)"""
+    if not value:
+        return ""
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return str(value)
+    return parsed.replace(tzinfo=None).isoformat()
+
+
+def game_hash(game: Dict) -> str:
+    """Content hash over the synced columns of a game row"""
+    content = {col: game.get(col) for col in SYNC_COLUMNS}
+    content["scheduled_date"] = _normalize_date(content["scheduled_date"])
+    encoded = json.dumps(content, sort_keys=True, default=str).encode()
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def fetch_stored_hashes(client, game_ids: List[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, str]:
+    """Read stored rows for game_ids in chunks and hash them"""
+    stored = {}
+    for chunk in _chunks(game_ids, chunk_size):
+        response = client.table("games").select(",".join(SYNC_COLUMNS)).in_("game_id", chunk).execute()
+        for row in response.data:
+            stored[row["game_id"]] = game_hash(row)
+    return stored
+
+
+def sync_games(client, games: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+    """
+    Upsert only new or changed games, in chunks of `chunk_size`.
+
+    Args:
+        client: Supabase client
+        games: Incoming game rows (later duplicates of a game_id win)
+        chunk_size: Rows per read and per upsert request
+
+    Returns:
+        Counts of inserted/updated/unchanged/failed games and elapsed seconds
+    """
+    started = time.perf_counter()
+
+    incoming = {g["game_id"]: {col: g.get(col) for col in SYNC_COLUMNS} for g in games}
+    stored = fetch_stored_hashes(client, list(incoming), chunk_size)
+
+    inserted, updated, unchanged = [], [], 0
+    for game_id, game in incoming.items():
+        if game_id not in stored:
+            inserted.append(game)
+        elif stored[game_id] != game_hash(game):
+            updated.append(game)
+        else:
+            unchanged += 1
+
+    now = datetime.utcnow().isoformat()
+    to_write = [{**game, "updated_at": now} for game in inserted + updated]
+    failed_ids = set()
+    for chunk in _chunks(to_write, chunk_size):
+        try:
+            client.table("games").upsert(chunk, on_conflict="game_id").execute()
+        except Exception as e:
+            print(f"✗ Bulk upsert of {len(chunk)} games failed: {e}")
+            failed_ids.update(g["game_id"] for g in chunk)
+
+    return {
+        "inserted": sum(1 for g in inserted if g["game_id"] not in failed_ids),
+        "updated": sum(1 for g in updated if g["game_id"] not in failed_ids),
+        "unchanged": unchanged,
+        "failed": len(failed_ids),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
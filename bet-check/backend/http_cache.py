@@ -0,0 +1,64 @@
+"""
+Conditional GET helpers.
+
+Read endpoints derive strong ETags from the version counters of the data
+they serve (game store, factor cache, accuracy aggregates), so a matching
+If-None-Match is answered with 304 before anything is queried or
+serialized.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import hashlib
+import uuid
+from typing import Optional
+
+from fastapi import Request, Response
+
+# In-process version counters restart at zero, so ETags built from them
+# include a per-process id to never repeat across restarts
+BOOT_ID = uuid.uuid4().hex[:8]
+
+# Clients may store responses but must revalidate before reuse; the
+# revalidation is a cheap 304 while the data version is unchanged
+REVALIDATE = "public, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the data versions (and query) a response depends on"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if If-None-Match lists this ETag (weak comparison, as RFC 9110 requires)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE, vary: Optional[str] = None) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=304, headers=headers)
+
+
+def set_cache_headers(
+    response: Response, etag: str, cache_control: str = REVALIDATE, vary: Optional[str] = None
+) -> None:
+    """
+    Args:
+        vary: Request headers that select between representations of the URL
+              (e.g. "Accept"), so shared caches key on them
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if vary:
+        response.headers["Vary"] = vary
@@ -0,0 +1,163 @@
+"""
+Single-writer learning queue.
+
+Result events from /log_result and /verify_result are queued and applied by
+one asyncio consumer. Events that arrive within a short window are merged,
+their weight deltas summed per factor, and the sum is applied in one write,
+so concurrent results never race on factors.current_weight and a burst of
+results costs one weight update instead of one per result.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import asyncio
+import itertools
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# Event status values
+QUEUED = "queued"
+APPLIED = "applied"    # deltas merged into a weight update
+SKIPPED = "skipped"    # nothing to learn (no stored prediction or contributions)
+FAILED = "failed"
+
+
+class LearningQueue:
+    """
+    Args:
+        resolve: Coroutine (game_id, actual_outcome) -> {factor_id: delta}
+        apply: Coroutine taking merged {factor_id: delta}, returning new weights
+        window: Seconds to keep collecting events after the first arrives
+        max_batch: Apply early once this many events are collected
+        history: Finished events kept for status lookups
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[str, str], Awaitable[Dict[int, float]]],
+        apply: Callable[[Dict[int, float]], Awaitable[Dict[int, float]]],
+        window: float = 0.05,
+        max_batch: int = 500,
+        history: int = 10000
+    ):
+        self._resolve = resolve
+        self._apply = apply
+        self.window = window
+        self.max_batch = max_batch
+        self.history = history
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._events: "OrderedDict[str, dict]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+
+        self.batches = 0
+        self.counts = {QUEUED: 0, APPLIED: 0, SKIPPED: 0, FAILED: 0}
+
+    # ---------- Producers ----------
+
+    def submit(self, game_id: str, actual_outcome: str) -> dict:
+        """Queue a result for learning and return its event record"""
+        event = {
+            "event_id": f"learn_{next(self._ids)}",
+            "game_id": game_id,
+            "actual_outcome": actual_outcome,
+            "status": QUEUED,
+            "submitted_at": datetime.utcnow().isoformat(),
+            "applied_at": None,
+            "batch_size": None,
+            "deltas": None,
+            "factor_weights": None,
+            "error": None,
+        }
+        self._events[event["event_id"]] = event
+        while len(self._events) > self.history:
+            self._events.popitem(last=False)
+        self.counts[QUEUED] += 1
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._queue.put_nowait(event)
+        return dict(event)
+
+    def status(self, event_id: str) -> Optional[dict]:
+        event = self._events.get(event_id)
+        return dict(event) if event else None
+
+    # ---------- Consumer ----------
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    closing = True
+                    break
+                batch.append(event)
+            await self._apply_batch(batch)
+
+    async def _apply_batch(self, batch: List[dict]) -> None:
+        resolved = await asyncio.gather(
+            *(self._resolve(e["game_id"], e["actual_outcome"]) for e in batch),
+            return_exceptions=True
+        )
+
+        merged: Dict[int, float] = {}
+        learners = []
+        for event, deltas in zip(batch, resolved):
+            if isinstance(deltas, Exception):
+                self._finish(event, FAILED, error=str(deltas))
+            elif not deltas:
+                self._finish(event, SKIPPED)
+            else:
+                event["deltas"] = deltas
+                learners.append(event)
+                for factor_id, delta in deltas.items():
+                    merged[factor_id] = merged.get(factor_id, 0.0) + delta
+
+        if not merged:
+            return
+        try:
+            new_weights = await self._apply(merged)
+        except Exception as e:
+            print(f"Error updating weights: {str(e)}")
+            for event in learners:
+                self._finish(event, FAILED, error=str(e))
+            return
+
+        self.batches += 1
+        for event in learners:
+            self._finish(event, APPLIED, batch_size=len(learners), factor_weights=new_weights)
+
+    def _finish(self, event: dict, status: str, **fields) -> None:
+        self.counts[QUEUED] -= 1
+        self.counts[status] += 1
+        event.update(status=status, applied_at=datetime.utcnow().isoformat(), **fields)
+
+    async def close(self) -> None:
+        """Apply everything already queued, then stop the consumer"""
+        if self._task and not self._task.done():
+            self._queue.put_nowait(None)
+            await self._task
+        self._task = None
+        # The drained queue is bound to this event loop; a restarted app gets a fresh one
+        self._queue = asyncio.Queue()
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, **self.counts}
@@ -0,0 +1,239 @@
+"""
+Adaptive live-score poller.
+
+Polls ESPN scoreboards only for the (sport, date) pairs that currently hold
+live or about-to-start games, pushes state and score changes into the game
+store, and hands every game whose `status.type.completed` flips to the
+result-logging path. The poll interval tightens as games approach their
+expected end and backs off when nothing is in play.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from espn_client import ESPNClient, SPORTS, parse_event
+from game_store import GameStore, SCHEDULED
+
+# Typical wall-clock length of a game, used to guess when it will finish
+GAME_LENGTH = {
+    "nba": timedelta(hours=2, minutes=30),
+    "nfl": timedelta(hours=3, minutes=15),
+}
+DEFAULT_GAME_LENGTH = timedelta(hours=3)
+
+# Fields copied from the scoreboard into the store while a game is running
+LIVE_FIELDS = ("state", "score_a", "score_b")
+
+
+def parse_start(game: dict) -> Optional[datetime]:
+    """UTC start time of a game, or None if only the date is known"""
+    value = game.get("start_time")
+    if not value:
+        return None
+    try:
+        start = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+
+
+def scoreboard_date(game: dict, start: datetime) -> str:
+    """The `dates` value ESPN lists a game under (US Eastern calendar day)"""
+    return game.get("scoreboard_date") or (start - timedelta(hours=5)).strftime("%Y%m%d")
+
+
+class LiveScorePoller:
+    """
+    Args:
+        store: Game store to read candidates from and write live state into
+        on_completed: Coroutine (game_id, winner) called once per finished game
+        client_factory: Builds the ESPNClient (swap the transport for a local stand-in)
+        min_interval: Seconds between polls while a game is near its expected end
+        live_interval: Seconds between polls while games are in progress
+        max_interval: Longest sleep when nothing is live or about to start
+        lead_time: Start polling this long before a scheduled start
+        near_end: Switch to min_interval this long before a game's expected end
+        max_overdue: Stop polling games this long past their expected end
+        now: Clock returning an aware UTC datetime
+    """
+
+    def __init__(
+        self,
+        store: GameStore,
+        on_completed: Callable[[str, str], Awaitable[object]],
+        client_factory: Callable[[], ESPNClient] = ESPNClient,
+        min_interval: float = 15.0,
+        live_interval: float = 60.0,
+        max_interval: float = 900.0,
+        lead_time: timedelta = timedelta(minutes=10),
+        near_end: timedelta = timedelta(minutes=20),
+        max_overdue: timedelta = timedelta(hours=6),
+        now: Callable[[], datetime] = lambda: datetime.now(timezone.utc)
+    ):
+        self.store = store
+        self.on_completed = on_completed
+        self.client_factory = client_factory
+        self.min_interval = min_interval
+        self.live_interval = live_interval
+        self.max_interval = max_interval
+        self.lead_time = lead_time
+        self.near_end = near_end
+        self.max_overdue = max_overdue
+        self.now = now
+
+        self._client: Optional[ESPNClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._failures = 0
+
+        self.polls = 0
+        self.requests = 0
+        self.completed = 0
+        self.next_interval: Optional[float] = None
+
+    # ---------- Scheduling ----------
+
+    def _expected_end(self, game: dict, start: datetime) -> datetime:
+        return start + GAME_LENGTH.get(game.get("sport"), DEFAULT_GAME_LENGTH)
+
+    def candidates(self, now: datetime) -> List[Tuple[dict, datetime]]:
+        """
+        Games without a result that are live or start within the lead time.
+        A "post" game is still polled until its result is logged (auto-logging
+        failed, or ESPN had not flagged a winner yet), up to max_overdue.
+        """
+        found = []
+        for game in self.store.list(status=SCHEDULED):
+            if game.get("sport") not in SPORTS:
+                continue
+            start = parse_start(game)
+            if start is None:
+                continue
+            if game.get("state") == "in" or (
+                start - self.lead_time <= now <= self._expected_end(game, start) + self.max_overdue
+            ):
+                found.append((game, start))
+        return found
+
+    def interval(self, now: datetime) -> float:
+        """Seconds until the next poll, from what is in play right now"""
+        live = self.candidates(now)
+        if live:
+            if any(now >= self._expected_end(game, start) - self.near_end for game, start in live):
+                interval = self.min_interval
+            elif any(game.get("state") == "in" or start <= now for game, start in live):
+                interval = self.live_interval
+            else:
+                # Only pre-game: wake up at the first start
+                first = min(start for _, start in live)
+                interval = max(self.min_interval, min(self.live_interval, (first - now).total_seconds()))
+        else:
+            upcoming = [
+                start - self.lead_time
+                for game in self.store.list(status=SCHEDULED)
+                if (start := parse_start(game)) and start - self.lead_time > now
+            ]
+            interval = self.max_interval
+            if upcoming:
+                interval = max(self.min_interval, min(interval, (min(upcoming) - now).total_seconds()))
+
+        # Back off while ESPN keeps failing
+        if self._failures:
+            interval = min(self.max_interval, interval * 2 ** min(self._failures, 6))
+        return interval
+
+    # ---------- Polling ----------
+
+    async def poll_once(self) -> float:
+        """Poll the scoreboards that hold candidate games; returns the next interval"""
+        now = self.now()
+        targets: Dict[Tuple[str, str], Dict[str, dict]] = {}
+        for game, start in self.candidates(now):
+            targets.setdefault((game["sport"], scoreboard_date(game, start)), {})[game["game_id"]] = game
+
+        if targets:
+            if self._client is None:
+                self._client = self.client_factory()
+            failures_before = self._client.timing_summary()["failures"]
+            boards = await asyncio.gather(
+                *(self._client.fetch_scoreboard(sport, date) for sport, date in targets)
+            )
+            self.polls += 1
+            self.requests += len(targets)
+            failed = self._client.timing_summary()["failures"] - failures_before
+            self._failures = self._failures + 1 if failed == len(targets) else 0
+            self._client.timings.clear()
+
+            for ((sport, _), watched), events in zip(targets.items(), boards):
+                for event in events:
+                    try:
+                        parsed = parse_event(event, sport)
+                    except Exception:
+                        continue
+                    if parsed and parsed["game_id"] in watched:
+                        await self._apply(watched[parsed["game_id"]], parsed)
+
+        self.next_interval = self.interval(self.now())
+        return self.next_interval
+
+    async def _apply(self, game: dict, parsed: dict) -> None:
+        changes = {f: parsed[f] for f in LIVE_FIELDS if f in parsed and parsed[f] != game.get(f)}
+        if changes:
+            self.store.update(game["game_id"], **changes)
+        if parsed.get("result") and not game.get("result"):
+            try:
+                await self.on_completed(game["game_id"], parsed["result"])
+                self.completed += 1
+            except Exception as e:
+                print(f"✗ Auto-logging result for {game['game_id']} failed: {e}")
+
+    # ---------- Lifecycle ----------
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                interval = await self.poll_once()
+            except Exception as e:
+                print(f"✗ Live poll failed: {e}")
+                self._failures += 1
+                interval = min(self.max_interval, self.live_interval * 2 ** min(self._failures, 6))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def wake(self) -> None:
+        """Poll now instead of waiting out the interval (e.g. after new games load)"""
+        self._wakeup.set()
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._task and not self._task.done()),
+            "polls": self.polls,
+            "requests": self.requests,
+            "completed": self.completed,
+            "consecutive_failures": self._failures,
+            "next_interval": self.next_interval,
+        }
@@ -7,28 +7,81 @@ Licensed under MIT License
 https://jmenichole.github.io/Portfolio/
 """
 
-from fastapi import FastAPI, HTTPException, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
+import sys
+import time
+import asyncio
+import hashlib
+import json
 from dotenv import load_dotenv
 import numpy as np
 from datetime import datetime
 from supabase import create_client, Client
 import stripe
 
+# Make sibling modules importable both as `backend.main` and via `python main.py`
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from factor_cache import FactorCache
+from espn_client import ESPNClient
+from db import SupabaseRepository, AsyncRepository
+from sqlite_repository import SqliteRepository
+from game_store import GameStore, SCHEDULED, game_sort_key, encode_cursor, decode_cursor
+from game_events import GameEventHub, game_event
+from prediction_memo import PredictionMemo
+from analytics import AccuracyAggregates, WINDOWS, favoring_factors
+from http_cache import BOOT_ID, make_etag, etag_matches, not_modified, set_cache_headers
+from write_behind import WriteBehindQueue
+from learning_queue import LearningQueue
+from team_features import TeamFeatureStore
+from teams import TEAMS
+from live_poller import LiveScorePoller
+import metrics
+
 # Load environment variables
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+FACTOR_CACHE_TTL = float(os.getenv("FACTOR_CACHE_TTL", "300"))
+DB_MAX_WORKERS = int(os.getenv("DB_MAX_WORKERS", "16"))
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()  # "supabase" or "sqlite"
+SQLITE_PATH = os.getenv("SQLITE_PATH", "betcheck.db")
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "200"))
+WRITE_FLUSH_INTERVAL = float(os.getenv("WRITE_FLUSH_INTERVAL", "0.5"))
+LEARNING_WINDOW = float(os.getenv("LEARNING_WINDOW", "0.05"))
+LIVE_POLLING = os.getenv("LIVE_POLLING", "true").lower() == "true"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background warm-up so the port binds before ESPN responds"""
+    warmup_tasks = [
+        asyncio.create_task(warm_up_games()),
+        asyncio.create_task(warm_up_analytics()),
+        asyncio.create_task(warm_up_features()),
+    ]
+    if LIVE_POLLING:
+        live_poller.start()
+    yield
+    for task in warmup_tasks:
+        task.cancel()
+    await live_poller.close()
+    # Apply queued results, then write out queued predictions, before exiting
+    await learning_queue.close()
+    await prediction_writer.close()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Sports Prediction API",
     description="AI-powered sports prediction engine with adaptive learning",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for frontend communication
@@ -38,11 +91,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Link"],
 )
 
+# Per-route request latency for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Initialize Supabase client (with fallback for demo mode)
 supabase: Client = None
-if SUPABASE_URL and SUPABASE_KEY and "your-project-id" not in SUPABASE_URL:
+if STORAGE_BACKEND == "sqlite":
+    print(f"Using local SQLite storage at {SQLITE_PATH}")
+elif SUPABASE_URL and SUPABASE_KEY and "your-project-id" not in SUPABASE_URL:
     try:
         supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
     except Exception as e:
@@ -81,6 +140,9 @@ class ResultLog(BaseModel):
     game_id: str
     actual_outcome: str
 
+class BatchPredictionRequest(BaseModel):
+    game_ids: List[str]
+
 # ==================== Demo Data (for when Supabase is not configured) ====================
 
 DEMO_FACTORS = [
@@ -91,62 +153,166 @@ DEMO_FACTORS = [
     {"factor_id": 5, "name": "Home Court Advantage", "base_weight": 0.20, "current_weight": 0.20, "min_weight": 0.05, "max_weight": 0.35},
 ]
 
+# Blocking data access lives in the repository; handlers go through `db`,
+# which offloads every call to a bounded thread pool
+if STORAGE_BACKEND == "sqlite":
+    repository = SqliteRepository(SQLITE_PATH, seed_factors=DEMO_FACTORS)
+elif supabase:
+    repository = SupabaseRepository(metrics.InstrumentedClient(supabase))
+else:
+    repository = None
+db = AsyncRepository(repository, max_workers=DB_MAX_WORKERS)
+
+def load_factors() -> List[dict]:
+    """Load factor rows from the database or demo data"""
+    if repository:
+        return repository.list_factors()
+    return DEMO_FACTORS
+
+# Factor weights are read on every prediction but only change when learning runs
+factor_cache = FactorCache(load_factors, ttl_seconds=FACTOR_CACHE_TTL)
+
+# Per-team factor inputs, built from results history at startup
+team_features = TeamFeatureStore()
+
+# Predictions only change when the weights (or team inputs) do, so memoize per (game, weight version)
+prediction_memo = PredictionMemo()
+
+# Running accuracy tallies, updated as results are logged
+accuracy_stats = AccuracyAggregates()
+
+# Predictions and their factor contributions are persisted off the request
+# path, in batches; `db` is looked up per flush so it can be swapped in tests
+prediction_writer = WriteBehindQueue(
+    lambda items: db.save_predictions(items),
+    key=lambda item: item["prediction"]["game_id"],
+    max_batch=WRITE_BATCH_SIZE,
+    flush_interval=WRITE_FLUSH_INTERVAL
+)
+
+# Weight learning has a single consumer: results arriving within
+# LEARNING_WINDOW are merged into one weight write and one cache bump
+learning_queue = LearningQueue(
+    lambda game_id, outcome: db.run(PredictionEngine.weight_deltas, game_id, outcome),
+    lambda deltas: db.run(PredictionEngine.apply_weight_deltas, deltas),
+    window=LEARNING_WINDOW
+)
+
 # Fetch live games from ESPN on startup
-def fetch_live_games():
+async def fetch_live_games():
     """Fetch current games from ESPN API - NBA focus"""
     try:
-        import requests
-        from datetime import timedelta
-        
-        # ESPN API endpoint - NBA focused
-        sport_path = "basketball/nba"
-        
-        all_games = []
-        
-        for days_ahead in range(5):  # Next 5 days
-            try:
-                target_date = datetime.now() + timedelta(days=days_ahead)
-                date_str = target_date.strftime("%Y%m%d")
-                url = f"http://site.api.espn.com/apis/site/v2/sports/{sport_path}/scoreboard?dates={date_str}"
-                
-                response = requests.get(url, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    events = data.get("events", [])
-                    
-                    for event in events:
-                        try:
-                            comps = event.get("competitions", [{}])[0]
-                            competitors = comps.get("competitors", [])
-                            if len(competitors) >= 2:
-                                all_games.append({
-                                    "game_id": f"nba_{event.get('id')}",
-                                    "sport": "nba",
-                                    "team_a": competitors[0].get("team", {}).get("displayName", "Unknown"),
-                                    "team_b": competitors[1].get("team", {}).get("displayName", "Unknown"),
-                                    "scheduled_date": event.get("date", "")[:10],
-                                    "result": None
-                                })
-                        except Exception as e:
-                            continue
-                    
-                    if events:
-                        print(f"✓ Loaded {len(events)} NBA games for {date_str}")
-            except Exception as e:
-                print(f"⚠ Failed to fetch NBA games: {e}")
-                continue
-        
-        print(f"📊 Total games loaded: {len(all_games)}")
+        async with ESPNClient() as client:
+            all_games = await client.fetch_games(["nba"], days_ahead=5)  # Next 5 days
+            summary = client.timing_summary()
+        
+        print(f"📊 Total games loaded: {len(all_games)} "
+              f"({summary['requests']} requests, slowest {summary['max_ms']}ms)")
         return all_games if all_games else None
     except Exception as e:
         print(f"✗ Error fetching live games: {e}")
         return None
 
-DEMO_GAMES = fetch_live_games() or [
+# Serve fallback games immediately; live games are swapped in by warm_up_games()
+DEMO_GAMES = [
     {"game_id": "nba_demo_1", "sport": "nba", "team_a": "Los Angeles Lakers", "team_b": "Boston Celtics", "scheduled_date": datetime.now().strftime("%Y-%m-%d"), "result": None},
     {"game_id": "nba_demo_2", "sport": "nba", "team_a": "Golden State Warriors", "team_b": "Denver Nuggets", "scheduled_date": datetime.now().strftime("%Y-%m-%d"), "result": None},
 ]
 
+# Indexed in-memory games (by game_id, sport, date and result status)
+game_store = GameStore(DEMO_GAMES)
+
+# Status, score and verification changes are pushed to /games/stream listeners
+game_events = GameEventHub()
+game_store.add_listener(game_events.on_games_changed)
+
+metrics.REGISTRY.gauge(
+    "betcheck_games_in_memory", "Games held in the in-memory store",
+    callback=lambda: len(game_store)
+)
+metrics.REGISTRY.gauge(
+    "betcheck_cache_hit_ratio", "Hit ratio of in-process caches", ("cache",),
+    callback=lambda: {
+        ("factors",): factor_cache.stats()["hit_ratio"],
+        ("predictions",): prediction_memo.stats()["hit_ratio"],
+    }
+)
+metrics.REGISTRY.gauge(
+    "betcheck_prediction_writes", "Write-behind prediction queue counters", ("state",),
+    callback=lambda: {(k,): v for k, v in prediction_writer.stats().items()}
+)
+metrics.REGISTRY.gauge(
+    "betcheck_learning_events", "Learning queue events by status, and batches applied", ("state",),
+    callback=lambda: {(k,): v for k, v in learning_queue.stats().items()}
+)
+
+WARMUP_STATUS = {
+    "state": "pending",  # pending -> running -> live | fallback | failed
+    "games_loaded": 0,
+    "duration_seconds": None,
+}
+
+async def warm_up_games():
+    """Fetch live games in the background and swap them in when ready"""
+    WARMUP_STATUS["state"] = "running"
+    started = time.perf_counter()
+    try:
+        live_games = await fetch_live_games()
+        
+        # Local storage keeps its own copy of the served games; written before
+        # the store swap so the store version never runs ahead of the database
+        if repository and repository.syncs_live_games:
+            await db.upsert_games(live_games or game_store.list())
+        
+        if live_games:
+            # Swapped under the store lock, so requests see either the old or new games
+            game_store.replace_all(live_games)
+            live_poller.wake()
+            WARMUP_STATUS["state"] = "live"
+        else:
+            WARMUP_STATUS["state"] = "fallback"
+        WARMUP_STATUS["games_loaded"] = len(game_store)
+    except Exception as e:
+        print(f"✗ Warm-up failed: {e}")
+        WARMUP_STATUS["state"] = "failed"
+    finally:
+        WARMUP_STATUS["duration_seconds"] = round(time.perf_counter() - started, 3)
+
+async def warm_up_analytics():
+    """Rebuild running analytics from stored results in one pass"""
+    if not repository:
+        return
+    try:
+        rows = await db.list_scored_predictions()
+        count = accuracy_stats.rebuild(rows)
+        print(f"📈 Analytics rebuilt from {count} scored predictions")
+    except Exception as e:
+        print(f"✗ Analytics rebuild failed: {e}")
+
+def load_scored_games(chunk_size: int = 500) -> List[dict]:
+    """Every game with a logged result (latest result wins). Blocking."""
+    outcomes: Dict[str, str] = {}
+    for page in repository.scan("results", "result_id,game_id,actual_outcome"):
+        for r in page:
+            outcomes[r["game_id"]] = r["actual_outcome"]
+    
+    game_ids = list(outcomes)
+    games = []
+    for i in range(0, len(game_ids), chunk_size):
+        for g in repository.get_games(game_ids[i:i + chunk_size]):
+            games.append({**g, "result": outcomes[g["game_id"]]})
+    return games
+
+async def warm_up_features():
+    """Build the team feature arrays and form buffers from results history in one pass"""
+    try:
+        factors = await db.run(factor_cache.get)
+        games = await db.run(load_scored_games) if repository else []
+        count = await db.run(team_features.build, factors, games)
+        print(f"🧮 Team features built from {count} results ({team_features.stats()['teams']} teams)")
+    except Exception as e:
+        print(f"✗ Team feature build failed: {e}")
+
 # ==================== Core Prediction Logic ====================
 
 class PredictionEngine:
@@ -170,161 +336,366 @@ class PredictionEngine:
         Returns:
             Prediction object with outcome, confidence, and reasoning
         """
+        return PredictionEngine.calculate_batch([
+            {"game_id": game_id, "team_a": team_a, "team_b": team_b}
+        ])[0]
+    
+    @staticmethod
+    def calculate_batch(games: List[dict], factors: Optional[Dict[int, dict]] = None) -> List[Prediction]:
+        """
+        Calculate predictions for many games in a single vectorized pass.
         
-        # Fetch factors from database or use demo data
-        if supabase:
-            factors_response = supabase.table("factors").select("*").execute()
-            factors = {f["factor_id"]: f for f in factors_response.data}
-        else:
-            factors = {f["factor_id"]: f for f in DEMO_FACTORS}
-        
-        # Mock sample factor calculations (in production, fetch from sports API)
-        factor_scores = {
-            1: {"team_a": 0.75, "team_b": 0.65, "name": "Recent Form"},
-            2: {"team_a": 0.70, "team_b": 0.80, "name": "Injury Status"},
-            3: {"team_a": 0.82, "team_b": 0.68, "name": "Offensive Efficiency"},
-            4: {"team_a": 0.72, "team_b": 0.75, "name": "Defensive Efficiency"},
-            5: {"team_a": 0.80, "team_b": 0.60, "name": "Home Court Advantage"},
-        }
+        Factors are fetched once, then a games x factors score matrix is
+        multiplied by the weight vector so every game is scored together.
         
-        # Calculate weighted scores
-        team_a_score = 0.0
-        team_b_score = 0.0
-        factor_contributions = {}
-        
-        for factor_id, scores in factor_scores.items():
-            if factor_id in factors:
-                weight = factors[factor_id]["current_weight"]
-                team_a_contribution = scores["team_a"] * weight
-                team_b_contribution = scores["team_b"] * weight
-                
-                team_a_score += team_a_contribution
-                team_b_score += team_b_contribution
-                
-                factor_contributions[scores["name"]] = {
-                    "team_a": round(team_a_contribution, 3),
-                    "team_b": round(team_b_contribution, 3)
-                }
+        Args:
+            games: Game dicts with at least game_id, team_a and team_b
+            factors: Factors keyed by factor_id (defaults to the factor cache)
+            
+        Returns:
+            Predictions in the same order as the input games
+        """
+        if not games:
+            return []
         
-        # Determine winner and confidence
-        if team_a_score > team_b_score:
-            predicted_outcome = team_a
-            confidence = min(100, (team_a_score / (team_a_score + team_b_score)) * 100)
-        else:
-            predicted_outcome = team_b
-            confidence = min(100, (team_b_score / (team_a_score + team_b_score)) * 100)
-        
-        # Get top 3 reasons
-        sorted_contributions = sorted(
-            factor_contributions.items(),
-            key=lambda x: abs(x[1]["team_a"] - x[1]["team_b"]),
-            reverse=True
-        )[:3]
-        
-        reasons = [
-            f"{name}: {predicted_outcome} has stronger {name.lower()} ({scores[('team_a' if predicted_outcome == team_a else 'team_b')]:.2f})"
-            for name, scores in sorted_contributions
-        ]
-        
-        return Prediction(
-            game_id=game_id,
-            predicted_outcome=predicted_outcome,
-            confidence=round(confidence, 2),
-            reasons=reasons,
-            factor_contributions=factor_contributions
-        )
+        # Factors come from the in-process cache; the DB is only hit on a miss
+        if factors is None:
+            factors = factor_cache.get()
+        
+        factor_ids = sorted(factors)
+        names = [factors[fid]["name"] for fid in factor_ids]
+        weights = np.array([float(factors[fid]["current_weight"]) for fid in factor_ids])
+        
+        # Games x factors input matrices: one row lookup per team in the feature store
+        scores_a, scores_b = team_features.matchups(games, factors, factor_ids)
+        
+        # Calculate weighted scores for every game at once
+        contrib_a = np.round(scores_a * weights, 3)
+        contrib_b = np.round(scores_b * weights, 3)
+        team_a_scores = scores_a @ weights
+        team_b_scores = scores_b @ weights
+        totals = team_a_scores + team_b_scores
+        
+        # Determine winners and confidence
+        a_wins = team_a_scores > team_b_scores
+        winning_scores = np.where(a_wins, team_a_scores, team_b_scores)
+        confidence = np.full(len(games), 50.0)
+        np.divide(winning_scores * 100, totals, out=confidence, where=totals > 0)
+        confidence = np.minimum(100, confidence)
+        
+        # Rank factors by contribution gap; stable sort keeps factor order on ties
+        gaps = np.abs(contrib_a - contrib_b)
+        top_factors = np.argsort(-gaps, axis=1, kind="stable")[:, :3]
+        
+        predictions = []
+        for i, game in enumerate(games):
+            predicted_outcome = game["team_a"] if a_wins[i] else game["team_b"]
+            winner_contrib = contrib_a[i] if a_wins[i] else contrib_b[i]
+            
+            reasons = [
+                f"{names[j]}: {predicted_outcome} has stronger {names[j].lower()} ({winner_contrib[j]:.2f})"
+                for j in top_factors[i]
+            ]
+            factor_contributions = {
+                name: {"team_a": float(contrib_a[i, j]), "team_b": float(contrib_b[i, j])}
+                for j, name in enumerate(names)
+            }
+            
+            predictions.append(Prediction(
+                game_id=game["game_id"],
+                predicted_outcome=predicted_outcome,
+                confidence=round(float(confidence[i]), 2),
+                reasons=reasons,
+                factor_contributions=factor_contributions
+            ))
+        
+        return predictions
     
     @staticmethod
-    def update_weights(game_id: str, actual_outcome: str) -> None:
+    def weight_deltas(game_id: str, actual_outcome: str) -> Dict[int, float]:
         """
-        Adaptive learning: adjust factor weights based on prediction accuracy.
+        Adaptive learning: weight changes earned by one result.
         Increases weights of factors that contributed to correct predictions.
         
+        Blocking read; the learning queue resolves events through db.run()
+        and applies the merged deltas with apply_weight_deltas().
+        
         Args:
             game_id: Game identifier
             actual_outcome: Actual game result
+            
+        Returns:
+            Delta per factor_id (empty if there is nothing to learn)
         """
+        if not repository:
+            return {}
         
+        # Fetch prediction and factors
+        prediction = repository.find_prediction(game_id)
+        if not prediction:
+            return {}
+        
+        was_correct = (prediction["predicted_outcome"] == actual_outcome)
+        
+        # Fetch prediction factor contributions
+        factor_ids = repository.contribution_factor_ids(prediction["prediction_id"])
+        
+        # Increase weights if prediction was correct, decrease if incorrect
+        adjustment = round(PredictionEngine.LEARNING_RATE * 0.1, 6)
+        delta = adjustment if was_correct else -adjustment
+        return {factor_id: delta for factor_id in factor_ids}
+    
+    @staticmethod
+    def apply_weight_deltas(deltas: Dict[int, float]) -> Dict[int, float]:
+        """
+        Apply merged deltas in one write and invalidate cached factors once.
+        Blocking: call it through db.run().
+        
+        Returns:
+            New weights keyed by factor_id
+        """
         try:
-            # Fetch prediction and factors
-            pred_response = supabase.table("predictions").select("*").eq("game_id", game_id).execute()
-            if not pred_response.data:
-                return
-            
-            prediction = pred_response.data[0]
-            was_correct = (prediction["predicted_outcome"] == actual_outcome)
-            
-            # Fetch prediction factor contributions
-            contrib_response = supabase.table("prediction_factor_contributions").select("*").eq(
-                "prediction_id", prediction["prediction_id"]
-            ).execute()
-            
-            contributions = contrib_response.data
-            
-            # Update factors based on correctness
-            for contrib in contributions:
-                factor_id = contrib["factor_id"]
-                
-                # Fetch current factor
-                factor_response = supabase.table("factors").select("*").eq("factor_id", factor_id).execute()
-                if not factor_response.data:
-                    continue
-                
-                factor = factor_response.data[0]
-                current_weight = factor["current_weight"]
-                
-                # Adjust weight based on prediction accuracy
-                if was_correct:
-                    # Increase weight if prediction was correct
-                    adjustment = PredictionEngine.LEARNING_RATE * 0.1
-                    new_weight = min(factor["max_weight"], current_weight + adjustment)
-                else:
-                    # Decrease weight if prediction was incorrect
-                    adjustment = PredictionEngine.LEARNING_RATE * 0.1
-                    new_weight = max(factor["min_weight"], current_weight - adjustment)
-                
-                # Update database
-                supabase.table("factors").update({
-                    "current_weight": new_weight,
-                    "updated_at": datetime.utcnow().isoformat()
-                }).eq("factor_id", factor_id).execute()
-        
-        except Exception as e:
-            print(f"Error updating weights: {str(e)}")
+            return repository.apply_weight_deltas(deltas)
+        finally:
+            # Weights may have changed, so drop cached factors
+            factor_cache.invalidate()
+
+def prediction_record(
+    game: dict, prediction: Prediction, weight_version: str, created_at: str, factors_by_name: Dict[str, dict]
+) -> dict:
+    """
+    Queue item for a prediction. Each factor's contribution value is its
+    weighted edge for the predicted team (negative if it favored the other);
+    the weight it was computed with is stored alongside, so training can
+    recover the raw input difference.
+    """
+    side, other = ("team_a", "team_b") if prediction.predicted_outcome == game["team_a"] else ("team_b", "team_a")
+    factors = [(factors_by_name[name], c) for name, c in prediction.factor_contributions.items()]
+    return {
+        "prediction": {
+            "game_id": prediction.game_id,
+            "predicted_outcome": prediction.predicted_outcome,
+            "confidence": prediction.confidence,
+            "weight_version": weight_version,
+            "created_at": created_at
+        },
+        "contributions": {f["factor_id"]: round(c[side] - c[other], 6) for f, c in factors},
+        "weights": {f["factor_id"]: float(f["current_weight"]) for f, _ in factors}
+    }
+
+async def predict_games(games: List[dict]) -> List[Prediction]:
+    """
+    Predict a list of games, serving memoized predictions where the factor
+    weights and the two teams' features have not changed. Newly computed
+    predictions are queued with their factor contributions for a batched
+    write keyed on (game_id, weight_version); the response does not wait for it.
+    """
+    factors, weights_version = await db.run(factor_cache.snapshot)
+    # Team inputs are part of what a stored prediction was computed from, but
+    # only the game's own two teams: a result elsewhere keeps its version
+    versions = {
+        g["game_id"]: f"{weights_version}+{features}" if features else weights_version
+        for g, features in zip(games, team_features.versions(games))
+    }
+    
+    predictions = {g["game_id"]: prediction_memo.get(g["game_id"], versions[g["game_id"]]) for g in games}
+    # Repeated game_ids are computed and queued once
+    missing = list({g["game_id"]: g for g in games if predictions[g["game_id"]] is None}.values())
+    
+    if missing:
+        fresh = await db.run(PredictionEngine.calculate_batch, missing, factors)
+        for prediction in fresh:
+            prediction_memo.put(prediction.game_id, versions[prediction.game_id], prediction)
+            predictions[prediction.game_id] = prediction
+        
+        # Store new predictions in database (if available)
+        if repository:
+            now = datetime.utcnow().isoformat()
+            by_name = {f["name"]: {**f, "factor_id": fid} for fid, f in factors.items()}
+            await prediction_writer.put([
+                prediction_record(game, p, versions[game["game_id"]], now, by_name)
+                for game, p in zip(missing, fresh)
+            ])
+    
+    return [predictions[g["game_id"]] for g in games]
+
+async def record_accuracy(game: dict, actual_outcome: str, stored_prediction: Optional[dict] = None) -> None:
+    """Count a scored game in the running analytics"""
+    prediction = prediction_memo.latest(game["game_id"])
+    if prediction:
+        predicted_outcome = prediction.predicted_outcome
+        confidence = prediction.confidence
+        factors = favoring_factors(prediction.factor_contributions, predicted_outcome == game["team_a"])
+    else:
+        if stored_prediction is None and repository:
+            stored_prediction = await db.find_prediction(game["game_id"])
+        if not stored_prediction:
+            return
+        predicted_outcome = stored_prediction["predicted_outcome"]
+        confidence = stored_prediction.get("confidence")
+        factors = await db.favoring_factor_names(stored_prediction["prediction_id"])
+    
+    accuracy_stats.record(
+        game["game_id"],
+        game.get("sport"),
+        predicted_outcome == actual_outcome,
+        confidence=confidence,
+        factors=factors
+    )
 
 # ==================== API Endpoints ====================
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "sports-prediction-api"}
+    return {
+        "status": "healthy",
+        "service": "sports-prediction-api",
+        "warmup": WARMUP_STATUS,
+        "games_in_memory": len(game_store),
+        "factor_cache": factor_cache.stats(),
+        "prediction_memo": prediction_memo.stats(),
+        "team_features": team_features.stats(),
+        "team_registry": TEAMS.stats(),
+        "prediction_writer": prediction_writer.stats(),
+        "learning_queue": learning_queue.stats(),
+        "game_stream": game_events.stats(),
+        "live_poller": live_poller.stats()
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+# /games paging: default and maximum page size, and rows per streamed page
+GAMES_PAGE_SIZE = 100
+GAMES_PAGE_MAX = 1000
+GAMES_STREAM_CHUNK = 500
+NDJSON = "application/x-ndjson"
+
+async def fetch_games_page(
+    sport: Optional[str],
+    after: Optional[tuple],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    limit: int
+) -> List[dict]:
+    """One keyset page of upcoming games from the database, or from memory in demo mode"""
+    if repository:
+        return await db.list_games_page(sport, after, date_from, date_to, limit)
+    # Both repositories only page games without a result
+    return game_store.page(
+        sport=sport, after=after, date_from=date_from, date_to=date_to, limit=limit, status=SCHEDULED
+    )
+
+async def stream_games_ndjson(
+    sport: Optional[str],
+    after: Optional[tuple],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    limit: Optional[int]
+):
+    """Yield one JSON line per game, reading a page at a time"""
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = GAMES_STREAM_CHUNK if remaining is None else min(GAMES_STREAM_CHUNK, remaining)
+        page = await fetch_games_page(sport, after, date_from, date_to, size)
+        for game in page:
+            yield json.dumps(Game(**game).model_dump()) + "\n"
+        if len(page) < size:
+            return
+        after = game_sort_key(page[-1])
+        if remaining is not None:
+            remaining -= len(page)
 
 @app.get("/games", response_model=List[Game])
-async def list_games(sport: Optional[str] = None):
+async def list_games(
+    request: Request,
+    response: Response,
+    sport: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=GAMES_PAGE_MAX),
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to")
+):
     """
     List upcoming games, optionally filtered by sport.
     
     Query Parameters:
         sport: Filter by sport (e.g., "nba", "nfl")
+        cursor: Continue after the last game of a previous page
+        limit: Page size (default 100, max 1000)
+        from / to: Scheduled date range, YYYY-MM-DD (inclusive)
+    
+    Pages are ordered by (scheduled_date, game_id); when more games follow,
+    the `X-Next-Cursor` and `Link` headers point at the next page.
+    With `Accept: application/x-ndjson` every matching game is streamed as
+    one JSON object per line (`limit` caps the total).
     
     Returns:
         List of upcoming games
     """
     try:
-        if supabase:
-            query = supabase.table("games").select("*").is_("result", True)
-            
-            if sport:
-                query = query.eq("sport", sport.lower())
-            
-            response = query.execute()
-            return response.data
+        after = decode_cursor(cursor) if cursor else None
+        for day in (date_from, date_to):
+            if day:
+                datetime.strptime(day, "%Y-%m-%d")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # When a version counter covers every change to the served games, it
+    # identifies the response and repeat requests skip the query: the game
+    # store's in demo mode, and in SQLite the database's own counter (bumped
+    # by triggers, so scripts writing the file directly are covered too).
+    # Supabase games are also written by scripts/update_games.py, so there
+    # the ETag is a hash of the body (saves bytes, not the query).
+    # JSON and NDJSON share the URL, so responses vary on Accept.
+    accept = request.headers.get("accept", "")
+    versioned = repository is None or repository.syncs_live_games
+    if versioned:
+        version = await db.games_version() if repository else game_store.version
+        etag = make_etag(BOOT_ID, "games", version, request.url.query, NDJSON in accept)
+        if etag_matches(request, etag):
+            return not_modified(etag, vary="Accept")
+        set_cache_headers(response, etag, vary="Accept")
+    else:
+        response.headers["Vary"] = "Accept"
+    
+    try:
+        if NDJSON in accept:
+            return StreamingResponse(
+                stream_games_ndjson(sport, after, date_from, date_to, limit),
+                media_type=NDJSON,
+                headers=dict(response.headers)
+            )
+        
+        if not (cursor or limit or date_from or date_to):
+            # Without paging parameters, keep returning the full list
+            if repository:
+                games = await db.list_games(sport)
+            else:
+                # Demo games without a result, like the paged and streamed listings
+                games = game_store.list(sport=sport, status=SCHEDULED)
         else:
-            # Return demo games
-            games = DEMO_GAMES
-            if sport:
-                games = [g for g in games if g["sport"].lower() == sport.lower()]
+            page_size = limit or GAMES_PAGE_SIZE
+            games = await fetch_games_page(sport, after, date_from, date_to, page_size + 1)
+            if len(games) > page_size:
+                games = games[:page_size]
+                next_cursor = encode_cursor(game_sort_key(games[-1]))
+                response.headers["X-Next-Cursor"] = next_cursor
+                next_url = request.url.include_query_params(cursor=next_cursor, limit=page_size)
+                response.headers["Link"] = f'<{next_url}>; rel="next"'
+        
+        if versioned:
             return games
+        
+        body = json.dumps([Game(**g).model_dump() for g in games]).encode()
+        etag = make_etag("games", hashlib.sha1(body).hexdigest())
+        if etag_matches(request, etag):
+            return not_modified(etag, vary="Accept")
+        set_cache_headers(response, etag, vary="Accept")
+        return Response(body, media_type="application/json", headers=dict(response.headers))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -342,32 +713,18 @@ async def get_prediction(game_id: str):
     """
     try:
         # Fetch game
-        if supabase:
-            game_response = supabase.table("games").select("*").eq("game_id", game_id).execute()
-            if not game_response.data:
+        if repository:
+            game = await db.get_game(game_id)
+            if not game:
                 raise HTTPException(status_code=404, detail="Game not found")
-            game = game_response.data[0]
         else:
             # Find in demo games
-            game = next((g for g in DEMO_GAMES if g["game_id"] == game_id), None)
+            game = game_store.get(game_id)
             if not game:
                 raise HTTPException(status_code=404, detail="Game not found")
         
-        # Calculate prediction
-        prediction = PredictionEngine.calculate_prediction(
-            game_id=game_id,
-            team_a=game["team_a"],
-            team_b=game["team_b"]
-        )
-        
-        # Store prediction in database (if available)
-        if supabase:
-            supabase.table("predictions").insert({
-                "game_id": game_id,
-                "predicted_outcome": prediction.predicted_outcome,
-                "confidence": prediction.confidence,
-                "created_at": datetime.utcnow().isoformat()
-            }).execute()
+        # Calculate prediction (memoized until the factor weights change)
+        prediction = (await predict_games([game]))[0]
         
         return prediction
     
@@ -376,6 +733,75 @@ async def get_prediction(game_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/predict/batch", response_model=List[Prediction])
+async def get_batch_predictions(batch: BatchPredictionRequest):
+    """
+    Get predictions for a slate of games in one request.
+    
+    Body:
+        game_ids: List of game identifiers
+    
+    Returns:
+        Predictions for every known game, in request order (unknown IDs are skipped)
+    """
+    try:
+        # Fetch all requested games in one read
+        if repository:
+            games_by_id = {g["game_id"]: g for g in await db.get_games(batch.game_ids)}
+            games = [games_by_id[gid] for gid in batch.game_ids if gid in games_by_id]
+        else:
+            games = game_store.get_many(batch.game_ids)
+        
+        if not games:
+            raise HTTPException(status_code=404, detail="No games found")
+        
+        predictions = await predict_games(games)
+        
+        return predictions
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def record_result(game_id: str, actual_outcome: str, verification_type: str, verified: bool) -> dict:
+    """
+    Store a game result, grade its prediction and queue adaptive learning.
+    Shared by /log_result and the live-score poller; returns the learning event.
+    """
+    # Update game result in memory
+    game = game_store.update(
+        game_id, result=actual_outcome, verified=verified, verification_type=verification_type
+    )
+    
+    # Store result
+    prediction = None
+    if repository:
+        # The prediction may still be waiting in the write-behind queue
+        await prediction_writer.ensure_written(game_id)
+        
+        await db.insert_result(game_id, actual_outcome, verification_type)
+        
+        # Update prediction with result
+        prediction = await db.find_prediction(game_id)
+        if prediction:
+            was_correct = (prediction["predicted_outcome"] == actual_outcome)
+            await db.mark_prediction_result(game_id, was_correct, verification_type)
+        
+        if game is None:
+            game = await db.get_game(game_id)
+    
+    if game:
+        # O(1) update of both teams' form buffers and feature rows, whether
+        # the game came from memory or the database
+        team_features.record_result(game, actual_outcome)
+        await record_accuracy(game, actual_outcome, prediction)
+    
+    # Queue adaptive learning; progress is available at /learning/{event_id}
+    event = learning_queue.submit(game_id, actual_outcome)
+    game_store.update(game_id, learning_event_id=event["event_id"])
+    return event
+
 @app.post("/log_result")
 async def log_result(result_log: ResultLog):
     """
@@ -389,45 +815,13 @@ async def log_result(result_log: ResultLog):
         Updated factor weights and verification method
     """
     try:
-        # Update game result in memory
-        global DEMO_GAMES
-        for game in DEMO_GAMES:
-            if game["game_id"] == result_log.game_id:
-                game["result"] = result_log.actual_outcome
-                game["verified"] = True
-                break
-        
-        # Store result
-        if supabase:
-            supabase.table("results").insert({
-                "game_id": result_log.game_id,
-                "actual_outcome": result_log.actual_outcome,
-                "verification_type": "manual",  # User manually logged
-                "created_at": datetime.utcnow().isoformat()
-            }).execute()
-            
-            # Update prediction with result
-            pred_response = supabase.table("predictions").select("*").eq(
-                "game_id", result_log.game_id
-            ).execute()
-            
-            if pred_response.data:
-                prediction = pred_response.data[0]
-                was_correct = (prediction["predicted_outcome"] == result_log.actual_outcome)
-                
-                supabase.table("predictions").update({
-                    "result_verified": True,
-                    "was_correct": was_correct,
-                    "verification_type": "manual"
-                }).eq("game_id", result_log.game_id).execute()
-        
-        # Trigger adaptive learning
-        PredictionEngine.update_weights(result_log.game_id, result_log.actual_outcome)
+        event = await record_result(result_log.game_id, result_log.actual_outcome, "manual", verified=True)
         
         return {
             "status": "success",
             "message": f"Result logged for game {result_log.game_id}",
-            "weights_updated": True,
+            "learning_event_id": event["event_id"],
+            "learning_status": event["status"],
             "verification_type": "manual"
         }
     
@@ -447,10 +841,8 @@ async def verify_result(game_id: str, is_correct: bool):
         Confirmation with adaptive learning status
     """
     try:
-        global DEMO_GAMES
-        
         # Find game
-        game = next((g for g in DEMO_GAMES if g["game_id"] == game_id), None)
+        game = game_store.get(game_id)
         if not game:
             raise HTTPException(status_code=404, detail="Game not found")
         
@@ -458,44 +850,45 @@ async def verify_result(game_id: str, is_correct: bool):
             raise HTTPException(status_code=400, detail="No result to verify for this game")
         
         # Mark as verified
-        game["verified"] = True
+        game_store.update(game_id, verified=True, verification_type="auto_verified" if is_correct else "auto_rejected")
         
         # Only trigger learning if result was correct
         if is_correct:
             print(f"✅ Result verified as CORRECT: {game_id}")
             
-            # Trigger adaptive learning
-            PredictionEngine.update_weights(game_id, game["result"])
+            if repository:
+                await db.insert_result(game_id, game["result"], "auto_verified")
             
-            if supabase:
-                supabase.table("results").insert({
-                    "game_id": game_id,
-                    "actual_outcome": game["result"],
-                    "verification_type": "auto_verified",
-                    "created_at": datetime.utcnow().isoformat()
-                }).execute()
+            # A result logged through /log_result or the live poller was already
+            # queued for learning and counted; verifying it only confirms it
+            if game.get("learning_event_id"):
+                event = learning_queue.status(game["learning_event_id"]) or {
+                    "event_id": game["learning_event_id"], "status": "applied"
+                }
+            else:
+                # Queue adaptive learning (needs the prediction to be stored)
+                await prediction_writer.ensure_written(game_id)
+                event = learning_queue.submit(game_id, game["result"])
+                game_store.update(game_id, learning_event_id=event["event_id"])
+                await record_accuracy(game, game["result"])
             
             return {
                 "status": "success",
                 "message": f"Result verified for {game_id}",
-                "weights_updated": True,
+                "learning_event_id": event["event_id"],
+                "learning_status": event["status"],
                 "verification_type": "auto_verified"
             }
         else:
             print(f"❌ Result marked as INCORRECT: {game_id}")
             
-            if supabase:
-                supabase.table("results").insert({
-                    "game_id": game_id,
-                    "actual_outcome": game["result"],
-                    "verification_type": "auto_rejected",
-                    "created_at": datetime.utcnow().isoformat()
-                }).execute()
+            if repository:
+                await db.insert_result(game_id, game["result"], "auto_rejected")
             
             return {
                 "status": "rejected",
                 "message": f"Result for {game_id} marked as incorrect",
-                "weights_updated": False,
+                "learning_event_id": None,
                 "verification_type": "auto_rejected"
             }
     
@@ -504,6 +897,83 @@ async def verify_result(game_id: str, is_correct: bool):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/learning/{event_id}")
+async def learning_status(event_id: str):
+    """
+    Status of a queued learning event (queued, applied, skipped or failed),
+    with the merged batch size and resulting factor weights once applied.
+    """
+    event = learning_queue.status(event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Learning event not found")
+    return event
+
+# Polls ESPN while games are live and logs results as soon as they go final
+live_poller = LiveScorePoller(
+    game_store,
+    lambda game_id, winner: record_result(game_id, winner, "auto", verified=False)
+)
+
+@app.get("/teams/{team}/form")
+async def team_form(team: str, sport: Optional[str] = None):
+    """
+    Recent form (last 5 results), current streak (negative for losses),
+    home/away record and average margin over the team's last 20 results.
+    `team` may be any known alias (e.g. "LAL", "Lakers").
+    Served from in-memory buffers; no database query.
+    """
+    form = team_features.team_form(team, sport)
+    if not form:
+        raise HTTPException(status_code=404, detail="No results for this team")
+    return form
+
+# Seconds between keep-alive comments on an idle event stream
+SSE_HEARTBEAT = 15.0
+
+def sse_message(event_id: int, payload: dict) -> str:
+    return f"id: {event_id}\nevent: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+
+@app.get("/games/stream")
+async def stream_games(request: Request, game_id: Optional[str] = None, sport: Optional[str] = None):
+    """
+    Server-Sent Events stream of game status, score and verification changes.
+    
+    Query Parameters:
+        game_id: Only this game (its current state is sent first)
+        sport: Only games of this sport
+    
+    Events are `game` (payload as in /games/status) or `resync` (the client
+    fell behind and should refetch). Idle connections get a comment every
+    SSE_HEARTBEAT seconds.
+    """
+    if game_id and game_id not in game_store:
+        raise HTTPException(status_code=404, detail="Game not found")
+    
+    async def events():
+        subscription = game_events.subscribe(game_id=game_id, sport=sport)
+        try:
+            yield "retry: 5000\n\n"
+            if game_id:
+                game = game_store.get(game_id)
+                if game:
+                    yield sse_message(0, {"type": "game", **game_event(game)})
+            while True:
+                item = await subscription.get(SSE_HEARTBEAT)
+                if item is None:
+                    if await request.is_disconnected():
+                        return
+                    yield ": ping\n\n"
+                    continue
+                yield sse_message(*item)
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/games/status/{game_id}")
 async def get_game_status(game_id: str):
     """
@@ -511,20 +981,15 @@ async def get_game_status(game_id: str):
     """
     try:
         # Find game
-        game = next((g for g in DEMO_GAMES if g["game_id"] == game_id), None)
+        game = game_store.get(game_id)
         if not game:
             raise HTTPException(status_code=404, detail="Game not found")
         
-        verification_type = None
-        if game.get("result"):
-            if supabase:
+        verification_type = game.get("verification_type")
+        if game.get("result") and not verification_type:
+            if repository:
                 try:
-                    result_response = supabase.table("results").select("verification_type").eq(
-                        "game_id", game_id
-                    ).order("created_at", desc=True).limit(1).execute()
-                    
-                    if result_response.data:
-                        verification_type = result_response.data[0].get("verification_type", "auto")
+                    verification_type = await db.latest_verification_type(game_id)
                 except:
                     verification_type = "auto" if not game.get("verified") else "unknown"
             else:
@@ -548,7 +1013,7 @@ async def get_game_status(game_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/factors", response_model=List[Factor])
-async def get_factors():
+async def get_factors(request: Request, response: Response):
     """
     Get all factors with their current weights.
     
@@ -556,52 +1021,63 @@ async def get_factors():
         List of all factors with base and current weights
     """
     try:
-        if supabase:
-            response = supabase.table("factors").select("*").execute()
-            return response.data
-        else:
-            return DEMO_FACTORS
+        factors = await db.run(factor_cache.get)
+        etag = make_etag(BOOT_ID, "factors", factor_cache.version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        set_cache_headers(response, etag)
+        return [factors[fid] for fid in sorted(factors)]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/analytics")
-async def get_analytics():
+async def get_analytics(request: Request, response: Response, sport: Optional[str] = None, window: str = "all"):
     """
     Get prediction accuracy metrics and performance statistics.
     
+    Served from running tallies, so the cost does not grow with history.
+    
+    Query Parameters:
+        sport: Filter by sport (e.g., "nba", "nfl")
+        window: "7d", "30d" or "all" (default)
+    
     Returns:
-        Overall accuracy, by-sport metrics, and factor effectiveness
+        Overall accuracy, by-sport metrics, confidence buckets and factor effectiveness
     """
+    if window not in WINDOWS:
+        raise HTTPException(status_code=400, detail=f"window must be one of: {', '.join(WINDOWS)}")
+    
+    # Tallies only change when a result is recorded; windowed views also
+    # shift at midnight (UTC), so the day is part of their ETag
+    day = datetime.utcnow().date() if WINDOWS[window] else None
+    etag = make_etag(BOOT_ID, "analytics", accuracy_stats.version, sport, window, day)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_cache_headers(response, etag)
+    
     try:
-        # Fetch all predictions with results
-        if supabase:
-            predictions_response = supabase.table("predictions").select("*").execute()
-            results_response = supabase.table("results").select("*").execute()
-            
-            predictions = predictions_response.data
-            results = results_response.data
-        else:
-            # Return demo analytics
-            predictions = []
-            results = []
+        stats = accuracy_stats.summary(sport=sport, window=window)
         
-        if not predictions or not results:
+        if not stats["total"]:
             return {
-                "total_predictions": len(predictions),
+                "total_predictions": 0,
                 "correct_predictions": 0,
                 "accuracy": 0.0,
+                "window": window,
+                "sport": sport,
                 "message": "Insufficient data for analysis"
             }
         
-        # Calculate accuracy
-        correct = sum(1 for p in predictions if p.get("was_correct", False))
-        accuracy = (correct / len(predictions)) * 100 if predictions else 0
-        
         return {
-            "total_predictions": len(predictions),
-            "correct_predictions": correct,
-            "accuracy": round(accuracy, 2),
-            "sample_size": len(predictions)
+            "total_predictions": stats["total"],
+            "correct_predictions": stats["correct"],
+            "accuracy": stats["accuracy"],
+            "sample_size": stats["total"],
+            "window": window,
+            "sport": sport,
+            "by_sport": stats["by_sport"],
+            "by_confidence": stats["by_confidence"],
+            "by_factor": stats["by_factor"]
         }
     
     except Exception as e:
@@ -0,0 +1,320 @@
+"""
+Prometheus metrics.
+
+Small in-process counters, histograms and gauges rendered in the Prometheus
+text exposition format for the /metrics endpoint, plus the hooks that feed
+them: an ASGI middleware for per-route request latency, a timer for DB round
+trips and a Supabase client wrapper that times every `.execute()`.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Prometheus client defaults (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+# Query builder methods that determine a Supabase call's operation label
+DB_OPERATIONS = ("select", "insert", "update", "upsert", "delete")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1])) for key, s in self._series.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(round(total, 6))}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Gauge read at scrape time from a callback.
+
+    The callback returns a number, or for labelled gauges a dict of
+    label-value tuples to numbers.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, *args, callback: Callable[[], object], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            return []
+        values = value if isinstance(value, dict) else {(): value}
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}"
+            for key, v in sorted(values.items())
+        ]
+
+
+class Registry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric  # re-registering replaces (e.g. module reloads)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        callback: Callable[[], object]
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback=callback))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Content type for the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "betcheck_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status")
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "betcheck_db_query_duration_seconds",
+    "Database round trip latency by table and operation",
+    ("table", "operation")
+)
+DB_ERRORS = REGISTRY.counter(
+    "betcheck_db_errors_total",
+    "Database round trips that raised",
+    ("table", "operation")
+)
+ESPN_FETCH_SECONDS = REGISTRY.histogram(
+    "betcheck_espn_fetch_duration_seconds",
+    "ESPN scoreboard request latency",
+    ("sport",)
+)
+ESPN_FETCH_FAILURES = REGISTRY.counter(
+    "betcheck_espn_fetch_failures_total",
+    "ESPN scoreboard requests that failed",
+    ("sport",)
+)
+
+
+@contextmanager
+def time_db(table: str, operation: str):
+    """Time one database round trip"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        DB_ERRORS.inc(table=table, operation=operation)
+        raise
+    finally:
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started, table=table, operation=operation)
+
+
+class _TimedQuery:
+    """Proxy for a postgrest query builder that times `execute()`"""
+
+    def __init__(self, builder, table: str, operation: str = "select"):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        operation = name if name in DB_OPERATIONS else self._operation
+        if not callable(attr):
+            # e.g. the `.not_` filter property returns another builder
+            return _TimedQuery(attr, self._table, operation) if hasattr(attr, "execute") else attr
+
+        def call(*args, **kwargs):
+            return _TimedQuery(attr(*args, **kwargs), self._table, operation)
+
+        return call
+
+    def execute(self):
+        with time_db(self._table, self._operation):
+            return self._builder.execute()
+
+
+class InstrumentedClient:
+    """
+    Wraps a Supabase client so every query's `execute()` is recorded in
+    DB_QUERY_SECONDS. RPC calls use the function name as the table label.
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name: str) -> _TimedQuery:
+        return _TimedQuery(self._client.table(name), name)
+
+    def rpc(self, name: str, params: Optional[dict] = None) -> _TimedQuery:
+        return _TimedQuery(self._client.rpc(name, params or {}), name, "rpc")
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route template
+    (e.g. /predict/{game_id}), so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=_route_template(scope),
+                status=status["code"]
+            )
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        # Older Starlette versions do not put the matched route in the scope
+        from starlette.routing import Match
+        app = scope.get("app")
+        for candidate in getattr(app, "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
@@ -0,0 +1,54 @@
+"""
+Memoized predictions keyed by game and factor weight version.
+
+A prediction only depends on the game and the current factor weights, so
+repeat views of the same game are served from memory until the weights
+change. Only one entry is kept per game, which bounds memory to the number
+of games being viewed.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+class PredictionMemo:
+    """Thread-safe (game_id, weight_version) -> prediction cache with hit/miss counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, game_id: str, weight_version: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry and entry[0] == weight_version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def latest(self, game_id: str) -> Optional[Any]:
+        """Last prediction served for a game, whatever its weight version"""
+        with self._lock:
+            entry = self._entries.get(game_id)
+            return entry[1] if entry else None
+
+    def put(self, game_id: str, weight_version: str, prediction: Any) -> None:
+        with self._lock:
+            self._entries[game_id] = (weight_version, prediction)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
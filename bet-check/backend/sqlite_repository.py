@@ -0,0 +1,442 @@
+"""
+Embedded SQLite storage backend.
+
+Implements the schema.sql tables and indexes on a local SQLite file in WAL
+mode, with the same methods as SupabaseRepository, so a single node can run
+with local reads and durable learning state (STORAGE_BACKEND=sqlite).
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from db import PRIMARY_KEYS
+from game_store import day_after
+from metrics import time_db
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+  game_id TEXT PRIMARY KEY,
+  sport TEXT NOT NULL,
+  team_a TEXT NOT NULL,
+  team_b TEXT NOT NULL,
+  scheduled_date TEXT NOT NULL,
+  result TEXT,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+  updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS factors (
+  factor_id INTEGER PRIMARY KEY,
+  name TEXT NOT NULL UNIQUE,
+  description TEXT,
+  base_weight REAL NOT NULL,
+  current_weight REAL NOT NULL,
+  min_weight REAL NOT NULL DEFAULT 0.05,
+  max_weight REAL NOT NULL DEFAULT 0.50,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+  updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS predictions (
+  prediction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  game_id TEXT NOT NULL REFERENCES games(game_id),
+  predicted_outcome TEXT NOT NULL,
+  confidence REAL NOT NULL,
+  weight_version TEXT NOT NULL DEFAULT '',
+  result_verified INTEGER DEFAULT 0,
+  was_correct INTEGER,
+  verification_type TEXT,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+  updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS prediction_factor_contributions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  prediction_id INTEGER NOT NULL REFERENCES predictions(prediction_id),
+  factor_id INTEGER NOT NULL REFERENCES factors(factor_id),
+  contribution_value REAL NOT NULL,
+  factor_weight REAL,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS results (
+  result_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  game_id TEXT NOT NULL REFERENCES games(game_id),
+  actual_outcome TEXT NOT NULL,
+  verification_type TEXT,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_games_sport ON games(sport);
+CREATE INDEX IF NOT EXISTS idx_games_scheduled ON games(scheduled_date);
+CREATE INDEX IF NOT EXISTS idx_predictions_game_id ON predictions(game_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_game_version ON predictions(game_id, weight_version);
+CREATE INDEX IF NOT EXISTS idx_predictions_was_correct ON predictions(was_correct);
+CREATE INDEX IF NOT EXISTS idx_prediction_factors_prediction_id ON prediction_factor_contributions(prediction_id);
+CREATE INDEX IF NOT EXISTS idx_results_game_id ON results(game_id);
+
+-- Change counter for the games table, bumped by triggers so writes from any
+-- process (the API, scripts/backfill_history.py, scripts/dedupe_games.py)
+-- invalidate /games ETags
+CREATE TABLE IF NOT EXISTS data_versions (
+  name TEXT PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO data_versions (name, version) VALUES ('games', 0);
+CREATE TRIGGER IF NOT EXISTS games_version_insert AFTER INSERT ON games
+BEGIN UPDATE data_versions SET version = version + 1 WHERE name = 'games'; END;
+CREATE TRIGGER IF NOT EXISTS games_version_update AFTER UPDATE ON games
+BEGIN UPDATE data_versions SET version = version + 1 WHERE name = 'games'; END;
+CREATE TRIGGER IF NOT EXISTS games_version_delete AFTER DELETE ON games
+BEGIN UPDATE data_versions SET version = version + 1 WHERE name = 'games'; END;
+"""
+
+# Columns stored as 0/1 that the API exposes as booleans
+BOOLEAN_COLUMNS = ("result_verified", "was_correct")
+
+GAME_COLUMNS = ("game_id", "sport", "team_a", "team_b", "scheduled_date", "result")
+FACTOR_COLUMNS = ("factor_id", "name", "description", "base_weight", "current_weight", "min_weight", "max_weight")
+
+# Statements are constant strings with ? placeholders, so sqlite3's
+# per-connection statement cache reuses the compiled (prepared) statement.
+SQL_UPSERT_GAME = """
+INSERT INTO games (game_id, sport, team_a, team_b, scheduled_date, result, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(game_id) DO UPDATE SET
+  sport = excluded.sport, team_a = excluded.team_a, team_b = excluded.team_b,
+  scheduled_date = excluded.scheduled_date, updated_at = excluded.updated_at,
+  -- A feed without a result must not erase one logged through the API
+  result = COALESCE(excluded.result, games.result)
+"""
+SQL_UPSERT_PREDICTION = """
+INSERT INTO predictions (game_id, predicted_outcome, confidence, weight_version, created_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(game_id, weight_version) DO UPDATE SET
+  predicted_outcome = excluded.predicted_outcome, confidence = excluded.confidence
+"""
+SQL_INSERT_CONTRIBUTION = """
+INSERT INTO prediction_factor_contributions (prediction_id, factor_id, contribution_value, factor_weight, created_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+SQL_ADJUST_WEIGHT = """
+UPDATE factors
+SET current_weight = ROUND(MIN(max_weight, MAX(min_weight, current_weight + ?)), 4), updated_at = ?
+WHERE factor_id = ?
+RETURNING factor_id, current_weight
+"""
+
+
+def _row_to_dict(row: sqlite3.Row) -> dict:
+    data = dict(row)
+    for col in BOOLEAN_COLUMNS:
+        if col in data and data[col] is not None:
+            data[col] = bool(data[col])
+    return data
+
+
+class SqliteRepository:
+    """
+    SQLite implementation of the repository interface used by the API.
+
+    Each worker thread gets its own connection (WAL lets readers run
+    alongside the single writer). Wrap in an AsyncRepository for handlers.
+    """
+
+    # Unlike Supabase (filled by scripts/update_games.py), the local database
+    # is kept in sync with the games the API fetches itself
+    syncs_live_games = True
+
+    def __init__(self, path: str, seed_factors: Iterable[dict] = ()):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        # Databases created before contributions recorded the factor weight
+        columns = {r[1] for r in conn.execute("PRAGMA table_info(prediction_factor_contributions)")}
+        if "factor_weight" not in columns:
+            conn.execute("ALTER TABLE prediction_factor_contributions ADD COLUMN factor_weight REAL")
+        if seed_factors and not conn.execute("SELECT 1 FROM factors LIMIT 1").fetchone():
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO factors ({', '.join(FACTOR_COLUMNS)}) VALUES ({', '.join('?' * len(FACTOR_COLUMNS))})",
+                    [tuple(f.get(col) for col in FACTOR_COLUMNS) for f in seed_factors]
+                )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _query(self, table: str, sql: str, params: Iterable = ()) -> List[dict]:
+        with time_db(table, "select"):
+            return [_row_to_dict(r) for r in self._conn().execute(sql, tuple(params)).fetchall()]
+
+    # ---------- Games ----------
+
+    def get_game(self, game_id: str) -> Optional[dict]:
+        rows = self._query("games", "SELECT * FROM games WHERE game_id = ?", (game_id,))
+        return rows[0] if rows else None
+
+    def get_games(self, game_ids: List[str]) -> List[dict]:
+        if not game_ids:
+            return []
+        placeholders = ", ".join("?" * len(game_ids))
+        return self._query("games", f"SELECT * FROM games WHERE game_id IN ({placeholders})", game_ids)
+
+    def list_games(self, sport: Optional[str] = None) -> List[dict]:
+        if sport:
+            return self._query(
+                "games",
+                "SELECT * FROM games WHERE result IS NULL AND sport = ? ORDER BY scheduled_date, game_id",
+                (sport.lower(),)
+            )
+        return self._query("games", "SELECT * FROM games WHERE result IS NULL ORDER BY scheduled_date, game_id")
+
+    def list_games_page(
+        self,
+        sport: Optional[str] = None,
+        after: Optional[Tuple[str, str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 100
+    ) -> List[dict]:
+        """
+        Upcoming games ordered by (scheduled_date, game_id), starting after a
+        keyset cursor, within [date_from, date_to] (inclusive days).
+        """
+        clauses, params = ["result IS NULL"], []
+        if sport:
+            clauses.append("sport = ?")
+            params.append(sport.lower())
+        if date_from:
+            clauses.append("scheduled_date >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("scheduled_date < ?")
+            params.append(day_after(date_to))
+        if after:
+            clauses.append("(scheduled_date, game_id) > (?, ?)")
+            params.extend(after)
+        params.append(limit)
+        return self._query(
+            "games",
+            f"SELECT * FROM games WHERE {' AND '.join(clauses)} ORDER BY scheduled_date, game_id LIMIT ?",
+            params
+        )
+
+    def games_version(self) -> int:
+        """Counter bumped on every write to games, by any process"""
+        rows = self._query("data_versions", "SELECT version FROM data_versions WHERE name = 'games'")
+        return rows[0]["version"] if rows else 0
+
+    def upsert_games(self, games: List[dict]) -> None:
+        now = datetime.utcnow().isoformat()
+        conn = self._conn()
+        with time_db("games", "upsert"), conn:
+            conn.executemany(SQL_UPSERT_GAME, [
+                tuple(g.get(col) for col in GAME_COLUMNS) + (now,) for g in games
+            ])
+
+    def merge_games(self, merges: Dict[str, str]) -> None:
+        """
+        Move predictions and results from duplicate game_ids onto their
+        canonical id ({duplicate: canonical}), then delete the duplicates,
+        in one transaction. The canonical rows must already exist.
+        """
+        pairs = [(new, old) for old, new in merges.items()]
+        olds = [(old,) for old in merges]
+        conn = self._conn()
+        with time_db("games", "merge"), conn:
+            conn.executemany("UPDATE OR IGNORE predictions SET game_id = ? WHERE game_id = ?", pairs)
+            # Left behind: same weight_version already predicted on the canonical game
+            conn.executemany(
+                "DELETE FROM prediction_factor_contributions WHERE prediction_id IN "
+                "(SELECT prediction_id FROM predictions WHERE game_id = ?)", olds
+            )
+            conn.executemany("DELETE FROM predictions WHERE game_id = ?", olds)
+            conn.executemany("UPDATE results SET game_id = ? WHERE game_id = ?", pairs)
+            conn.executemany("DELETE FROM games WHERE game_id = ?", olds)
+
+    # ---------- Factors ----------
+
+    def list_factors(self) -> List[dict]:
+        return self._query("factors", "SELECT * FROM factors ORDER BY factor_id")
+
+    def adjust_factor_weights(self, factor_ids: List[int], delta: float) -> Dict[int, float]:
+        """Shift weights by delta, clamped to min/max, in one transaction"""
+        return self.apply_weight_deltas({factor_id: delta for factor_id in factor_ids})
+
+    def apply_weight_deltas(self, deltas: Dict[int, float]) -> Dict[int, float]:
+        """Shift each factor's weight by its own delta, clamped to min/max, in one transaction"""
+        now = datetime.utcnow().isoformat()
+        conn = self._conn()
+        new_weights = {}
+        with time_db("factors", "update"), conn:
+            for factor_id, delta in deltas.items():
+                for row in conn.execute(SQL_ADJUST_WEIGHT, (delta, now, factor_id)).fetchall():
+                    new_weights[row["factor_id"]] = row["current_weight"]
+        return new_weights
+
+    def set_factor_weights(self, weights: Dict[int, float]) -> None:
+        """Replace current weights in one transaction (e.g. after offline training)"""
+        now = datetime.utcnow().isoformat()
+        conn = self._conn()
+        with time_db("factors", "update"), conn:
+            conn.executemany(
+                "UPDATE factors SET current_weight = ?, updated_at = ? WHERE factor_id = ?",
+                [(weight, now, factor_id) for factor_id, weight in weights.items()]
+            )
+
+    # ---------- Predictions ----------
+
+    def save_predictions(self, items: List[dict]) -> None:
+        """
+        Write predictions with their factor contributions in one transaction.
+
+        Each item is {"prediction": row, "contributions": {factor_id: value},
+        "weights": {factor_id: weight used}}; contributions of a re-saved
+        prediction are replaced, not duplicated.
+        """
+        now = datetime.utcnow().isoformat()
+        conn = self._conn()
+        with time_db("predictions", "upsert"), conn:
+            contributions = []
+            for item in items:
+                r = item["prediction"]
+                prediction_id = conn.execute(SQL_UPSERT_PREDICTION + " RETURNING prediction_id", (
+                    r["game_id"], r["predicted_outcome"], r["confidence"], r.get("weight_version", ""),
+                    r.get("created_at") or now
+                )).fetchone()[0]
+                conn.execute("DELETE FROM prediction_factor_contributions WHERE prediction_id = ?", (prediction_id,))
+                weights = item.get("weights", {})
+                contributions.extend(
+                    (prediction_id, factor_id, value, weights.get(factor_id), now)
+                    for factor_id, value in item["contributions"].items()
+                )
+            conn.executemany(SQL_INSERT_CONTRIBUTION, contributions)
+
+    def find_prediction(self, game_id: str) -> Optional[dict]:
+        rows = self._query(
+            "predictions",
+            "SELECT * FROM predictions WHERE game_id = ? ORDER BY created_at DESC, prediction_id DESC LIMIT 1",
+            (game_id,)
+        )
+        return rows[0] if rows else None
+
+    def mark_prediction_result(self, game_id: str, was_correct: bool, verification_type: str) -> None:
+        conn = self._conn()
+        with time_db("predictions", "update"), conn:
+            conn.execute(
+                "UPDATE predictions SET result_verified = 1, was_correct = ?, verification_type = ?, updated_at = ? "
+                "WHERE game_id = ?",
+                (int(was_correct), verification_type, datetime.utcnow().isoformat(), game_id)
+            )
+
+    def list_scored_predictions(self) -> List[dict]:
+        """Verified predictions with their game's sport and favoring factors, for rebuilding analytics"""
+        rows = self._query(
+            "predictions",
+            "SELECT p.prediction_id, p.game_id, p.confidence, p.was_correct, g.sport, "
+            "COALESCE(p.updated_at, p.created_at) AS scored_at "
+            "FROM predictions p LEFT JOIN games g ON g.game_id = p.game_id "
+            "WHERE p.result_verified = 1 ORDER BY p.prediction_id"
+        )
+        favoring: Dict[int, List[str]] = {}
+        for r in self._query(
+            "prediction_factor_contributions",
+            "SELECT c.prediction_id, f.name FROM prediction_factor_contributions c "
+            "JOIN predictions p ON p.prediction_id = c.prediction_id "
+            "JOIN factors f ON f.factor_id = c.factor_id "
+            "WHERE p.result_verified = 1 AND c.contribution_value > 0 ORDER BY c.id"
+        ):
+            favoring.setdefault(r["prediction_id"], []).append(r["name"])
+        return [{**r, "factors": favoring.get(r["prediction_id"], [])} for r in rows]
+
+    def favoring_factor_names(self, prediction_id: int) -> List[str]:
+        """Factors whose stored contribution favored the predicted team"""
+        rows = self._query(
+            "prediction_factor_contributions",
+            "SELECT f.name FROM prediction_factor_contributions c JOIN factors f ON f.factor_id = c.factor_id "
+            "WHERE c.prediction_id = ? AND c.contribution_value > 0 ORDER BY c.id",
+            (prediction_id,)
+        )
+        return [r["name"] for r in rows]
+
+    def contribution_factor_ids(self, prediction_id: int) -> List[int]:
+        rows = self._query(
+            "prediction_factor_contributions",
+            "SELECT DISTINCT factor_id FROM prediction_factor_contributions WHERE prediction_id = ? ORDER BY factor_id",
+            (prediction_id,)
+        )
+        return [r["factor_id"] for r in rows]
+
+    # ---------- Results ----------
+
+    def insert_result(self, game_id: str, actual_outcome: str, verification_type: str) -> None:
+        """
+        Store a result and set it on the game row in one transaction, so the
+        game leaves the upcoming listings and the games version is bumped.
+        """
+        now = datetime.utcnow().isoformat()
+        conn = self._conn()
+        with time_db("results", "insert"), conn:
+            conn.execute(
+                "INSERT INTO results (game_id, actual_outcome, verification_type, created_at) VALUES (?, ?, ?, ?)",
+                (game_id, actual_outcome, verification_type, now)
+            )
+            conn.execute(
+                "UPDATE games SET result = ?, updated_at = ? WHERE game_id = ? AND result IS NOT ?",
+                (actual_outcome, now, game_id, actual_outcome)
+            )
+
+    def insert_results(self, results: List[dict]) -> int:
+        """
+        Bulk insert results (game_id, actual_outcome, verification_type) in
+        one transaction, skipping games that already have a result.
+        Returns the number inserted.
+        """
+        now = datetime.utcnow().isoformat()
+        conn = self._conn()
+        with time_db("results", "insert"), conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO results (game_id, actual_outcome, verification_type, created_at) "
+                "SELECT ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM results WHERE game_id = ?)",
+                [
+                    (r["game_id"], r["actual_outcome"], r.get("verification_type"), now, r["game_id"])
+                    for r in results
+                ]
+            )
+            return conn.total_changes - before
+
+    def latest_verification_type(self, game_id: str) -> Optional[str]:
+        rows = self._query(
+            "results",
+            "SELECT verification_type FROM results WHERE game_id = ? ORDER BY created_at DESC, result_id DESC LIMIT 1",
+            (game_id,)
+        )
+        return (rows[0]["verification_type"] or "auto") if rows else None
+
+    # ---------- Bulk reads ----------
+
+    def scan(self, table: str, columns: str = "*", page_size: int = 1000) -> Iterator[List[dict]]:
+        """Yield every row of a table in pages ordered by primary key"""
+        key = PRIMARY_KEYS[table]  # also rejects unknown table names
+        cursor = self._conn().execute(f"SELECT {columns} FROM {table} ORDER BY {key}")
+        while True:
+            with time_db(table, "select"):
+                rows = cursor.fetchmany(page_size)
+            if not rows:
+                return
+            yield [_row_to_dict(r) for r in rows]
@@ -0,0 +1,237 @@
+"""
+Array-backed per-team feature store.
+
+Every team's registry id is its row, and every factor a column in two
+contiguous float arrays: one holding each team's inputs when it is team_a
+(home), one when it is team_b (away). The arrays are built in one pass over
+the results history at startup and the two affected rows are refreshed as
+each result is logged, so the factor inputs for a slate of matchups are a
+single fancy-indexed gather that PredictionEngine.calculate_batch
+multiplies by the weight vector directly.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from team_form import TeamForm, game_margin
+from teams import TEAMS
+
+SIDES = ("team_a", "team_b")
+
+# Inputs used before any history exists (the engine's original fixed
+# scores), keyed by factor name. Teams without history keep these, so their
+# predictions do not change until results come in.
+FEATURE_PRIORS = {
+    "Recent Form": {"team_a": 0.75, "team_b": 0.65},
+    "Injury Status": {"team_a": 0.70, "team_b": 0.80},
+    "Offensive Efficiency": {"team_a": 0.82, "team_b": 0.68},
+    "Defensive Efficiency": {"team_a": 0.72, "team_b": 0.75},
+    "Home Court Advantage": {"team_a": 0.80, "team_b": 0.60},
+}
+DEFAULT_PRIOR = 0.5
+
+# Games of evidence at which history and prior count equally
+PRIOR_GAMES = 5.0
+
+
+def _prior(name: str, side: str) -> float:
+    return FEATURE_PRIORS.get(name, {}).get(side, DEFAULT_PRIOR)
+
+
+# Factors derived from the per-team result buffers, as (successes, trials)
+# per team for a side. Factors not listed here (injuries, efficiencies need
+# box scores) keep their prior for every team.
+FEATURE_SOURCES = {
+    "Recent Form": lambda s, side: (s["recent_wins"], s["recent_games"]),
+    "Home Court Advantage": lambda s, side: (
+        (s["home_wins"], s["home_games"]) if side == "team_a" else (s["away_wins"], s["away_games"])
+    ),
+}
+
+
+def _at_prior(tables: Dict[str, np.ndarray], row: int) -> bool:
+    """True if a team's rows are still the prior rows (no history moved them)"""
+    return all(np.array_equal(tables[side][row], tables[side][-1]) for side in SIDES)
+
+
+def _hash_team(digest, tables: Dict[str, np.ndarray], name: str, row: int) -> None:
+    """Feed a team's name and both of its feature rows into a digest"""
+    digest.update(name.encode())
+    for side in SIDES:
+        digest.update(np.round(tables[side][row], 6).tobytes())
+
+
+class TeamFeatureStore:
+    """
+    One (teams + 1) x factors array per side, rows indexed by team id.
+
+    The extra last row holds the priors, so an unknown team's lookup index
+    of -1 lands on it without a branch.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.form = TeamForm()
+        self.columns: Dict[int, int] = {}
+        self.names: List[str] = []
+        self.tables: Dict[str, np.ndarray] = {side: np.empty((1, 0)) for side in SIDES}
+        self.games = 0
+        self._scored: Set[str] = set()
+
+    def _fill(self, tables: Dict[str, np.ndarray], rows: np.ndarray) -> None:
+        """Recompute the given team rows from their result buffers"""
+        stats = self.form.counts(rows)
+        for side in SIDES:
+            for col, name in enumerate(self.names):
+                source = FEATURE_SOURCES.get(name)
+                if source:
+                    prior = _prior(name, side)
+                    wins, played = source(stats, side)
+                    tables[side][rows, col] = (wins + prior * PRIOR_GAMES) / (played + PRIOR_GAMES)
+
+    def _fingerprint(self) -> str:
+        """
+        Digest of every team's rows in team name order, skipping teams still
+        at their priors: a function of the results history alone, so the same
+        history gives the same value whether it was built at startup or
+        recorded one result at a time, in any process.
+        """
+        digest = hashlib.sha1()
+        for team_id in sorted(range(len(self.form)), key=TEAMS.name):
+            if not _at_prior(self.tables, team_id):
+                _hash_team(digest, self.tables, TEAMS.name(team_id), team_id)
+        return digest.hexdigest()[:8]
+
+    def _grow(self, teams: int) -> None:
+        """Add prior rows so team ids below `teams` have a row of their own"""
+        for side in SIDES:
+            table = self.tables[side]
+            missing = teams + 1 - len(table)
+            if missing > 0:
+                self.tables[side] = np.vstack([table[:-1], np.repeat(table[-1:], missing + 1, axis=0)])
+
+    def build(self, factors: Dict[int, dict], history: Iterable[dict]) -> int:
+        """
+        Rebuild buffers and arrays from scored games (team_a, team_b, result
+        and scheduled_date). Returns the number of games used.
+        """
+        rows = sorted(
+            (g for g in history if g.get("result") in (g.get("team_a"), g.get("team_b"))),
+            key=lambda g: g.get("scheduled_date") or ""
+        )
+        results = [
+            (*TEAMS.game_teams(g, register=True), g["result"] == g["team_a"], game_margin(g))
+            for g in rows
+        ]
+        factor_ids = sorted(factors)
+        with self._lock:
+            self.form.rebuild(results)
+            teams = len(self.form)
+            self.columns = {fid: col for col, fid in enumerate(factor_ids)}
+            self.names = [factors[fid]["name"] for fid in factor_ids]
+            tables = {
+                side: np.tile([_prior(name, side) for name in self.names], (teams + 1, 1))
+                for side in SIDES
+            }
+            self._fill(tables, np.arange(teams))
+            self.tables = tables
+            self.games = len(rows)
+            self._scored = {g["game_id"] for g in rows if "game_id" in g}
+        return len(rows)
+
+    def record_result(self, game: dict, winner: str) -> bool:
+        """
+        Add a newly logged result: two buffer writes, then the two teams'
+        rows are refreshed. Returns False if the game was already counted.
+        """
+        if winner not in (game.get("team_a"), game.get("team_b")):
+            return False
+        team_a, team_b = TEAMS.game_teams(game, register=True)
+        with self._lock:
+            if game["game_id"] in self._scored:
+                return False
+            self._scored.add(game["game_id"])
+            self.form.record(team_a, team_b, winner == game["team_a"], game_margin(game))
+            self._grow(len(self.form))
+            self._fill(self.tables, np.array([team_a, team_b]))
+            self.games += 1
+        return True
+
+    def versions(self, games: Sequence[dict]) -> List[str]:
+        """
+        Feature version per game: a digest of its two teams' rows, taken in
+        team name order so it does not depend on registry ids. Empty while
+        both teams still have the prior rows, so their predictions keep the
+        version they had before any history.
+        """
+        versions = []
+        with self._lock:
+            tables = self.tables
+            prior_rows = len(tables[SIDES[0]]) - 1
+            sides = [TEAMS.side_ids(games, side) for side in SIDES]
+            for game, team_a, team_b in zip(games, *sides):
+                teams = sorted(
+                    (TEAMS.name(team_id), team_id) if 0 <= team_id < prior_rows else (game.get(side) or "", -1)
+                    for side, team_id in zip(SIDES, (team_a, team_b))
+                )
+                if all(_at_prior(tables, row) for _, row in teams):
+                    versions.append("")
+                    continue
+                digest = hashlib.sha1()
+                for name, row in teams:
+                    _hash_team(digest, tables, name, row)
+                versions.append(digest.hexdigest()[:8])
+        return versions
+
+    def matchups(
+        self, games: Sequence[dict], factors: Dict[int, dict], factor_ids: List[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Games x factors input matrices for team_a and team_b, columns in
+        factor_ids order. Factors added since the last build use their prior.
+        """
+        # Under the lock: a logged result may add rows or refresh cells in place
+        with self._lock:
+            columns, tables = self.columns, self.tables
+            rows = {}
+            for side in SIDES:
+                ids = np.array(TEAMS.side_ids(games, side), dtype=np.intp)
+                # Teams registered since the arrays were sized have no row yet: use the priors
+                ids[ids >= len(tables[side]) - 1] = -1
+                rows[side] = ids
+            if all(fid in columns for fid in factor_ids):
+                cols = np.fromiter((columns[fid] for fid in factor_ids), dtype=np.intp, count=len(factor_ids))
+                return tuple(tables[side][rows[side][:, None], cols] for side in SIDES)
+
+            scores = []
+            for side in SIDES:
+                matrix = np.empty((len(games), len(factor_ids)))
+                for j, fid in enumerate(factor_ids):
+                    if fid in columns:
+                        matrix[:, j] = tables[side][rows[side], columns[fid]]
+                    else:
+                        matrix[:, j] = _prior(factors[fid]["name"], side)
+                scores.append(matrix)
+            return tuple(scores)
+
+    def team_form(self, team: str, sport: Optional[str] = None) -> Optional[dict]:
+        """Rolling form, streak and home/away splits for a team, by any alias"""
+        team_id = TEAMS.resolve(sport, team)
+        form = self.form.summary(team_id) if team_id is not None else None
+        if form:
+            form = {"team_id": team_id, "team": TEAMS.name(team_id), **form}
+        return form
+
+    def stats(self) -> dict:
+        with self._lock:
+            # Hashes every team, so computed on demand rather than per result;
+            # empty history leaves predictions as they were, so no fingerprint
+            fingerprint = self._fingerprint() if self.games else ""
+            return {"teams": len(self.form), "games": self.games, "fingerprint": fingerprint}
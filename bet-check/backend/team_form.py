@@ -0,0 +1,144 @@
+"""
+Per-team ring buffers of recent results.
+
+Each team owns a fixed-size row (its registry id) in a few NumPy arrays
+(won, home, margin) used as a circular buffer, so logging a result is two
+O(1) slot writes and rolling form, streaks and home/away splits are read
+straight from the buffers without querying `results`. The buffers are rebuilt from history in
+one chronological pass at startup.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+def game_margin(game: dict) -> float:
+    """team_a's points margin, or NaN when scores are unknown"""
+    try:
+        return float(game["score_a"]) - float(game["score_b"])
+    except (KeyError, TypeError, ValueError):
+        return np.nan
+
+
+class TeamForm:
+    """
+    Args:
+        capacity: Results kept per team (the span of home/away splits)
+        window: Results counted by rolling form
+    """
+
+    def __init__(self, capacity: int = 20, window: int = 5):
+        self.capacity = capacity
+        self.window = window
+        self._lock = threading.Lock()
+        self._reset(16)
+
+    def _reset(self, rows: int) -> None:
+        self.teams = 0  # rows in use: highest team id seen + 1
+        self._won = np.zeros((rows, self.capacity), dtype=bool)
+        self._home = np.zeros((rows, self.capacity), dtype=bool)
+        self._margin = np.full((rows, self.capacity), np.nan)
+        self._head = np.zeros(rows, dtype=np.intp)   # next slot to write
+        self._count = np.zeros(rows, dtype=np.intp)  # filled slots
+
+    def __len__(self) -> int:
+        return self.teams
+
+    def _reserve(self, team_id: int) -> None:
+        """Make sure a row exists for team_id, doubling the arrays if needed"""
+        if team_id >= len(self._head):
+            grow = max(len(self._head), team_id + 1 - len(self._head))
+            self._won = np.vstack([self._won, np.zeros((grow, self.capacity), dtype=bool)])
+            self._home = np.vstack([self._home, np.zeros((grow, self.capacity), dtype=bool)])
+            self._margin = np.vstack([self._margin, np.full((grow, self.capacity), np.nan)])
+            self._head = np.concatenate([self._head, np.zeros(grow, dtype=np.intp)])
+            self._count = np.concatenate([self._count, np.zeros(grow, dtype=np.intp)])
+        self.teams = max(self.teams, team_id + 1)
+
+    def _push(self, row: int, won: bool, home: bool, margin: float) -> None:
+        slot = self._head[row]
+        self._won[row, slot] = won
+        self._home[row, slot] = home
+        self._margin[row, slot] = margin
+        self._head[row] = (slot + 1) % self.capacity
+        self._count[row] = min(self._count[row] + 1, self.capacity)
+
+    # ---------- Updates ----------
+
+    def record(self, team_a: int, team_b: int, a_won: bool, margin: float = np.nan) -> None:
+        """Add one result to both teams' buffers (by team id). team_a is the home side."""
+        with self._lock:
+            self._reserve(max(team_a, team_b))
+            self._push(team_a, a_won, True, margin)
+            self._push(team_b, not a_won, False, -margin)
+
+    def rebuild(self, results: Iterable[Tuple[int, int, bool, float]]) -> int:
+        """Replay (team_a, team_b, a_won, margin) results, oldest first, into empty buffers"""
+        with self._lock:
+            self._reset(16)
+        count = 0
+        for team_a, team_b, a_won, margin in results:
+            self.record(team_a, team_b, a_won, margin)
+            count += 1
+        return count
+
+    # ---------- Reads ----------
+
+    def _recent_slots(self, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Slots of each row's last k results, newest first, and which are filled"""
+        back = np.arange(k)
+        slots = (self._head[rows, None] - 1 - back) % self.capacity
+        return slots, back < self._count[rows, None]
+
+    def counts(self, rows: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Win/game counts per row: rolling form and home/away splits"""
+        with self._lock:
+            if rows is None:
+                rows = np.arange(self.teams)
+            slots, filled = self._recent_slots(rows, self.window)
+            recent_won = self._won[rows[:, None], slots] & filled
+
+            filled_all = np.arange(self.capacity) < self._count[rows, None]
+            won, home = self._won[rows], self._home[rows]
+            return {
+                "recent_games": filled.sum(axis=1).astype(float),
+                "recent_wins": recent_won.sum(axis=1).astype(float),
+                "home_games": (home & filled_all).sum(axis=1).astype(float),
+                "home_wins": (home & won & filled_all).sum(axis=1).astype(float),
+                "away_games": (~home & filled_all).sum(axis=1).astype(float),
+                "away_wins": (~home & won & filled_all).sum(axis=1).astype(float),
+            }
+
+    def summary(self, team_id: int) -> Optional[dict]:
+        """Form, streak and splits for one team, or None if it has no results"""
+        with self._lock:
+            row = team_id
+            count = int(self._count[row]) if 0 <= row < self.teams else 0
+            if not count:
+                return None
+            slots, _ = self._recent_slots(np.array([row]), count)
+            slots = slots[0]
+            won = self._won[row, slots]
+            home = self._home[row, slots]
+            margins = self._margin[row, slots]
+
+        streak = 0
+        while streak < count and won[streak] == won[0]:
+            streak += 1
+        recent = won[:self.window]
+        known = margins[~np.isnan(margins)]
+        return {
+            "games": count,
+            "last_results": "".join("W" if w else "L" for w in recent),
+            "form": round(float(recent.mean()), 3),
+            "streak": streak if won[0] else -streak,
+            "home": {"wins": int((won & home).sum()), "losses": int((~won & home).sum())},
+            "away": {"wins": int((won & ~home).sum()), "losses": int((~won & ~home).sum())},
+            "avg_margin": round(float(known.mean()), 2) if len(known) else None,
+        }
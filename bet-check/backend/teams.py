@@ -0,0 +1,153 @@
+"""
+Canonical team and game identity.
+
+Every ingest path names teams and keys games the same way: teams are
+interned into a registry that hands out compact integer ids and resolves
+every known alias (display name, short name, abbreviation, "location name",
+ESPN team id) to them; games are keyed `{sport}_{espn_event_id}`. In-memory
+joins (team features, form buffers) are keyed on the integer ids.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Legacy keys: scripts/update_games.py wrote `{sport}_{id}_{YYYYMMDD}`
+_DATED_KEY = re.compile(r"^([a-z]+)_(\d+)_\d{8}$")
+_NOT_ALNUM = re.compile(r"[^a-z0-9& ]+")
+
+
+def game_key(sport: str, event_id) -> str:
+    """The one game_id scheme: lower-case sport and the ESPN event id"""
+    return f"{sport.lower()}_{event_id}"
+
+
+def canonical_game_id(game_id: str, sport: Optional[str] = None) -> str:
+    """Map a game_id written by an older ingest path onto game_key()"""
+    match = _DATED_KEY.match(game_id)
+    if match:
+        return game_key(match.group(1), match.group(2))
+    if game_id.isdigit() and sport:
+        # scripts/espn_fetcher.py stored the bare event id
+        return game_key(sport, game_id)
+    return game_id
+
+
+def normalize(name: str) -> str:
+    """Alias lookup key: case, punctuation and spacing insensitive"""
+    return " ".join(_NOT_ALNUM.sub(" ", name.lower()).split())
+
+
+class TeamRegistry:
+    """
+    Thread-safe team interning. Ids are dense from 0 in first-seen order,
+    so they double as row numbers in per-team arrays.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._sports: List[str] = []
+        self._aliases: Dict[Tuple[str, str], int] = {}
+        # Exact spellings already resolved, so hot lookups skip normalize()
+        self._seen: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, sport: str, name: str, aliases: Iterable[str] = ()) -> int:
+        """
+        Id for a team, registering it (and any new aliases) if needed.
+
+        Identity comes from `name` alone, within the sport: it must already
+        be a known name of a team for the two to be the same. Aliases only
+        add lookups and never merge teams, since a short name or
+        abbreviation can be shared; one already taken keeps its first team.
+        `name` becomes the canonical name when the team is new.
+        """
+        sport = sport.lower()
+        name_key = (sport, normalize(name))
+        keys = [(sport, normalize(a)) for a in aliases if a]
+        with self._lock:
+            team_id = self._aliases.get(name_key)
+            if team_id is None:
+                team_id = len(self._names)
+                self._names.append(name)
+                self._sports.append(sport)
+                self._aliases[name_key] = team_id
+            for key in keys:
+                self._aliases.setdefault(key, team_id)
+        return team_id
+
+    def resolve(self, sport: Optional[str], name: Optional[str]) -> Optional[int]:
+        """Id for a known alias (any sport if none given), without registering"""
+        if not name:
+            return None
+        if sport:
+            team_id = self._seen.get((sport, name))
+            if team_id is None:
+                with self._lock:
+                    team_id = self._aliases.get((sport.lower(), normalize(name)))
+                    if team_id is not None:
+                        self._seen[(sport, name)] = team_id
+            return team_id
+        key = normalize(name)
+        with self._lock:
+            return next((tid for (_, alias), tid in self._aliases.items() if alias == key), None)
+
+    def name(self, team_id: int) -> str:
+        return self._names[team_id]
+
+    def canonical(self, sport: str, name: Optional[str]) -> Optional[str]:
+        """Canonical spelling of a team name (unknown names are returned as given)"""
+        team_id = self.resolve(sport, name)
+        return self._names[team_id] if team_id is not None else name
+
+    def game_teams(self, game: dict, register: bool = False) -> Tuple[int, int]:
+        """
+        (team_a, team_b) ids of a game; -1 for a team never seen unless
+        `register` interns it.
+        """
+        ids = []
+        for side in ("team_a", "team_b"):
+            team_id = game.get(f"{side}_id")
+            if team_id is None:
+                if register and game.get(side):
+                    team_id = self.intern(game.get("sport") or "", game[side])
+                else:
+                    team_id = self.resolve(game.get("sport"), game.get(side))
+            ids.append(-1 if team_id is None else team_id)
+        return ids[0], ids[1]
+
+    def side_ids(self, games: Iterable[dict], side: str) -> List[int]:
+        """game_teams() for one side of many games (-1 for unknown teams), without registering"""
+        id_key, seen, ids = f"{side}_id", self._seen, []
+        for game in games:
+            team_id = game.get(id_key)
+            if team_id is None:
+                team_id = seen.get((game.get("sport"), game.get(side)))
+                if team_id is None:
+                    team_id = self.resolve(game.get("sport"), game.get(side))
+            ids.append(-1 if team_id is None else team_id)
+        return ids
+
+    def stats(self) -> dict:
+        return {"teams": len(self._names), "aliases": len(self._aliases)}
+
+
+# Process-wide registry shared by the API, live poller and scripts
+TEAMS = TeamRegistry()
+
+
+def espn_aliases(team: dict) -> List[str]:
+    """Names ESPN uses for a team across endpoints"""
+    location_name = f"{team.get('location', '')} {team.get('name', '')}".strip()
+    aliases = [
+        team.get("shortDisplayName"), team.get("abbreviation"), location_name,
+        f"espn:{team['id']}" if team.get("id") else None,
+    ]
+    return [a for a in aliases if a]
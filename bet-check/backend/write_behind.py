@@ -0,0 +1,156 @@
+"""
+Write-behind queue for non-critical inserts.
+
+Request handlers enqueue rows and return immediately; a background task
+groups queued rows and hands them to a writer in batches, flushing
+when a batch fills up or a time limit passes. Failed batches are retried
+with backoff, and closing the queue drains whatever is still pending.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class WriteBehindQueue:
+    """
+    Batches items for an async writer.
+
+    Args:
+        writer: Coroutine function that persists a list of items
+        key: Maps an item to a key so callers can force out a specific
+             item before reading it back (see `ensure_written`)
+        max_batch: Flush as soon as this many items are pending
+        flush_interval: Flush pending items at least this often (seconds)
+        max_retries: Attempts per batch before it is dropped
+        retry_backoff: Initial delay between attempts (doubles each retry)
+        max_pending: Enqueuing waits for a flush beyond this many items
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[Any]], Awaitable[None]],
+        key: Callable[[Any], str] = lambda item: "",
+        max_batch: int = 200,
+        flush_interval: float = 0.5,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        max_pending: int = 10000
+    ):
+        self._writer = writer
+        self._key = key
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_pending = max_pending
+
+        self._pending: List[Any] = []
+        self._pending_keys: Dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.dropped = 0
+
+    # ---------- Lifecycle ----------
+
+    def _ensure_started(self) -> None:
+        """Start the flusher on the running loop the first time it is needed"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._pending:
+                await self.flush()
+
+    async def close(self) -> None:
+        """Stop the flusher and write everything still pending"""
+        self._closed = True
+        if self._task:
+            # Let an in-flight batch finish rather than cancelling it
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    # ---------- Producers ----------
+
+    async def put(self, items: List[Any]) -> None:
+        """Queue items for writing; only waits if the backlog is over max_pending"""
+        if self._closed:
+            await self._write_with_retries(list(items))
+            return
+        self._ensure_started()
+        for item in items:
+            self._pending.append(item)
+            key = self._key(item)
+            self._pending_keys[key] = self._pending_keys.get(key, 0) + 1
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        if len(self._pending) > self.max_pending:
+            await self.flush()
+
+    async def ensure_written(self, key: str) -> None:
+        """Flush now if an item with this key is still pending"""
+        if key in self._pending_keys:
+            await self.flush()
+
+    # ---------- Flushing ----------
+
+    async def flush(self) -> None:
+        """Write all pending items in batches of max_batch"""
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                try:
+                    await self._write_with_retries(batch)
+                finally:
+                    for item in batch:
+                        key = self._key(item)
+                        remaining = self._pending_keys.get(key, 0) - 1
+                        if remaining > 0:
+                            self._pending_keys[key] = remaining
+                        else:
+                            self._pending_keys.pop(key, None)
+
+    async def _write_with_retries(self, batch: List[Any]) -> None:
+        delay = self.retry_backoff
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await self._writer(batch)
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.dropped += len(batch)
+                    print(f"✗ Dropped {len(batch)} queued writes after {attempt} attempts: {e}")
+                    return
+                self.retries += 1
+                print(f"⚠ Queued write failed (attempt {attempt}), retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "batches": self.batches,
+            "retries": self.retries,
+            "dropped": self.dropped,
+        }
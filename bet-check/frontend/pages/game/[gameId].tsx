@@ -51,6 +51,18 @@ export default function GamePrediction() {
     if (!gameId) return
 
     fetchGameAndPrediction()
+
+    // Push result and verification changes instead of polling
+    const source = new EventSource(`${API_URL}/games/stream?game_id=${gameId}`)
+    source.addEventListener('game', (event) => {
+      const update = JSON.parse((event as MessageEvent).data)
+      setGame((current) => (current ? { ...current, result: update.result } : current))
+      if (update.result) {
+        setVerificationType(update.verification_type ?? (update.verified ? null : 'auto'))
+      }
+    })
+    source.addEventListener('resync', () => fetchGameAndPrediction())
+    return () => source.close()
   }, [gameId])
 
   const fetchGameAndPrediction = async () => {
@@ -33,6 +33,7 @@ CREATE TABLE IF NOT EXISTS predictions (
   game_id TEXT NOT NULL REFERENCES games(game_id),
   predicted_outcome TEXT NOT NULL,
   confidence DECIMAL(5, 2) NOT NULL,
+  weight_version TEXT NOT NULL DEFAULT '',
   result_verified BOOLEAN DEFAULT FALSE,
   was_correct BOOLEAN,
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -45,6 +46,9 @@ CREATE TABLE IF NOT EXISTS prediction_factor_contributions (
   prediction_id INTEGER NOT NULL REFERENCES predictions(prediction_id),
   factor_id INTEGER NOT NULL REFERENCES factors(factor_id),
   contribution_value DECIMAL(10, 6) NOT NULL,
+  -- Factor weight the contribution was computed with (contribution = input difference x weight)
+  -- Existing databases: ALTER TABLE prediction_factor_contributions ADD COLUMN IF NOT EXISTS factor_weight DECIMAL(10, 6);
+  factor_weight DECIMAL(10, 6),
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -60,10 +64,62 @@ CREATE TABLE IF NOT EXISTS results (
 CREATE INDEX IF NOT EXISTS idx_games_sport ON games(sport);
 CREATE INDEX IF NOT EXISTS idx_games_scheduled ON games(scheduled_date);
 CREATE INDEX IF NOT EXISTS idx_predictions_game_id ON predictions(game_id);
+-- One prediction row per game and factor weight version (backend upserts on this key)
+-- Existing databases: first run
+--   ALTER TABLE predictions ADD COLUMN IF NOT EXISTS weight_version TEXT NOT NULL DEFAULT '';
+--   UPDATE predictions SET weight_version = 'legacy-' || prediction_id WHERE weight_version = '';
+CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_game_version ON predictions(game_id, weight_version);
 CREATE INDEX IF NOT EXISTS idx_predictions_was_correct ON predictions(was_correct);
 CREATE INDEX IF NOT EXISTS idx_prediction_factors_prediction_id ON prediction_factor_contributions(prediction_id);
 CREATE INDEX IF NOT EXISTS idx_results_game_id ON results(game_id);
 
+-- Atomically shift factor weights, clamped to each factor's min/max.
+-- Used by adaptive learning so all contributing factors update in one statement.
+CREATE OR REPLACE FUNCTION adjust_factor_weights(factor_ids INTEGER[], delta NUMERIC)
+RETURNS TABLE (factor_id INTEGER, current_weight NUMERIC)
+LANGUAGE sql
+AS $$
+  UPDATE factors f
+  SET current_weight = LEAST(f.max_weight, GREATEST(f.min_weight, f.current_weight + delta)),
+      updated_at = CURRENT_TIMESTAMP
+  WHERE f.factor_id = ANY(factor_ids)
+  RETURNING f.factor_id, f.current_weight;
+$$;
+
+-- Merge duplicate games onto their canonical game_id in one transaction.
+-- `merges` is {"duplicate_game_id": "canonical_game_id", ...}; the canonical
+-- rows must already exist. A duplicate's prediction whose weight_version the
+-- canonical game (or an earlier duplicate) already has is dropped with its
+-- contributions, so moving the rest cannot break idx_predictions_game_version.
+-- Used by scripts/dedupe_games.py.
+CREATE OR REPLACE FUNCTION merge_games(merges JSONB)
+RETURNS void
+LANGUAGE sql
+AS $$
+  WITH m AS (SELECT old_id, new_id FROM jsonb_each_text(merges) AS m(old_id, new_id)),
+  ranked AS (
+    SELECT p.prediction_id, ROW_NUMBER() OVER (
+      PARTITION BY COALESCE(m.new_id, p.game_id), p.weight_version
+      ORDER BY (m.old_id IS NOT NULL), p.prediction_id
+    ) AS rn
+    FROM predictions p LEFT JOIN m ON m.old_id = p.game_id
+    WHERE p.game_id IN (SELECT old_id FROM m UNION SELECT new_id FROM m)
+  ),
+  dropped AS (
+    DELETE FROM prediction_factor_contributions
+    WHERE prediction_id IN (SELECT prediction_id FROM ranked WHERE rn > 1)
+  )
+  DELETE FROM predictions WHERE prediction_id IN (SELECT prediction_id FROM ranked WHERE rn > 1);
+
+  UPDATE predictions p SET game_id = m.new_id
+  FROM jsonb_each_text(merges) AS m(old_id, new_id) WHERE p.game_id = m.old_id;
+
+  UPDATE results r SET game_id = m.new_id
+  FROM jsonb_each_text(merges) AS m(old_id, new_id) WHERE r.game_id = m.old_id;
+
+  DELETE FROM games WHERE game_id IN (SELECT jsonb_object_keys(merges));
+$$;
+
 -- Enable Row Level Security (RLS) for multi-tenant support
 ALTER TABLE games ENABLE ROW LEVEL SECURITY;
 ALTER TABLE factors ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,204 @@
+"""
+Backfill historical games and results from saved ESPN scoreboards.
+
+Reads directories of scoreboard JSON saved one file per date (the response
+body of `.../{sport}/scoreboard?dates=YYYYMMDD`), parses the files in a
+process pool and streams the normalized games through a generator
+pipeline into storage in bulk batches:
+
+    files -> parse (process pool, bounded in flight) -> games -> batches
+          -> upsert_games + insert_results
+
+At most `--workers * 2` files are parsed or waiting and one batch of games
+is held at a time, so memory stays flat however many seasons are imported.
+Completed games get a result row (verification_type "backfill") unless they
+already have one, and games are upserted by key, so re-running an import is
+safe. Unreadable files and events that fail to parse are skipped and listed
+at the end.
+
+The sport comes from the directory name (e.g. history/nba/20240115.json)
+unless --sport is given.
+
+Usage:
+    python scripts/backfill_history.py history/nba history/nfl
+    python scripts/backfill_history.py scoreboards/ --sport nba --workers 8 --batch-size 2000
+    python scripts/backfill_history.py history/nba --dry-run    # parse and count only
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from db import SupabaseRepository, get_supabase_client
+from espn_client import SPORTS, parse_event
+from sqlite_repository import SqliteRepository
+
+load_dotenv()
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "betcheck.db")
+
+VERIFICATION_TYPE = "backfill"
+
+# Columns written to storage; ids, scores and live state are in-memory only
+GAME_FIELDS = ("game_id", "sport", "team_a", "team_b", "scheduled_date", "result")
+
+
+def get_repository():
+    if STORAGE_BACKEND == "sqlite":
+        return SqliteRepository(SQLITE_PATH)
+    return SupabaseRepository(get_supabase_client())
+
+
+# ==================== Pipeline stages ====================
+
+def scoreboard_files(directories: Iterable[str], sport: Optional[str]) -> Iterator[Tuple[str, str]]:
+    """(path, sport) for every saved scoreboard, oldest date first per directory"""
+    for directory in directories:
+        dir_sport = (sport or os.path.basename(os.path.normpath(directory))).lower()
+        if dir_sport not in SPORTS:
+            raise SystemExit(f"Can't tell the sport of {directory}; pass --sport ({', '.join(SPORTS)})")
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".json"):
+                yield os.path.join(directory, name), dir_sport
+
+
+def parse_file(path: str, sport: str) -> Tuple[str, List[dict], List[str]]:
+    """
+    Runs in a worker process. Returns (path, game rows, errors). A file that
+    cannot be read, or an event that cannot be parsed, is reported in
+    `errors` and skipped instead of failing the import.
+    """
+    try:
+        with open(path) as f:
+            events = list(json.load(f).get("events") or [])
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        return path, [], [str(e)]
+    games, errors = [], []
+    for index, event in enumerate(events):
+        try:
+            game = parse_event(event, sport)
+        except Exception as e:
+            event_id = event.get("id") if isinstance(event, dict) else None
+            errors.append(f"event {event_id or f'#{index}'}: {type(e).__name__}: {e}")
+            continue
+        if game:
+            games.append({col: game.get(col) for col in GAME_FIELDS})
+    return path, games, errors
+
+
+def parse_files(files: Iterable[Tuple[str, str]], workers: int, stats: "Progress") -> Iterator[dict]:
+    """
+    Parse files in a process pool, keeping at most 2 per worker in flight,
+    and yield their games in file order.
+    """
+    max_pending = workers * 2
+    files = iter(files)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for path, sport in files:
+            pending.append((path, pool.submit(parse_file, path, sport)))
+            if len(pending) >= max_pending:
+                break
+        while pending:
+            path, future = pending.popleft()
+            try:
+                _, games, errors = future.result()
+            except Exception as e:
+                games, errors = [], [f"{type(e).__name__}: {e}"]
+            next_file = next(files, None)
+            if next_file:
+                pending.append((next_file[0], pool.submit(parse_file, *next_file)))
+            stats.files += 1
+            stats.failed.extend(f"{path}: {error}" for error in errors)
+            yield from games
+
+
+def batches(games: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    """Group games into lists of `size`, a later copy of a game_id replacing an earlier one"""
+    batch = {}
+    for game in games:
+        batch[game["game_id"]] = game
+        if len(batch) >= size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+
+
+def results_for(games: List[dict]) -> List[dict]:
+    return [
+        {"game_id": g["game_id"], "actual_outcome": g["result"], "verification_type": VERIFICATION_TYPE}
+        for g in games if g["result"]
+    ]
+
+
+# ==================== Progress ====================
+
+class Progress:
+    def __init__(self, total_files: int):
+        self.total_files = total_files
+        self.files = 0
+        self.games = 0
+        self.results = 0
+        self.inserted_results = 0
+        self.failed: List[str] = []
+        self.started = time.perf_counter()
+
+    def report(self, final: bool = False) -> None:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        line = (
+            f"{self.files}/{self.total_files} files  {self.games} games  "
+            f"{self.results} results ({self.inserted_results} new)  "
+            f"{self.files / elapsed:.0f} files/s  {self.games / elapsed:.0f} games/s  {elapsed:.1f}s"
+        )
+        print(line if final else f"  {line}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import saved ESPN scoreboards into storage")
+    parser.add_argument("directories", nargs="+", help="Directories of scoreboard JSON, one file per date")
+    parser.add_argument("--sport", help=f"Sport of every directory ({', '.join(SPORTS)}); default: directory name")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Parser processes")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Games per storage write")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and count without writing")
+    args = parser.parse_args()
+
+    total_files = sum(1 for _ in scoreboard_files(args.directories, args.sport))
+    print(f"Backfilling {total_files} scoreboard files with {args.workers} workers"
+          f"{' (dry run)' if args.dry_run else ''}")
+    repository = None if args.dry_run else get_repository()
+    progress = Progress(total_files)
+
+    games = parse_files(scoreboard_files(args.directories, args.sport), args.workers, progress)
+    for batch in batches(games, args.batch_size):
+        results = results_for(batch)
+        if repository:
+            repository.upsert_games(batch)
+            progress.inserted_results += repository.insert_results(results) if results else 0
+        progress.games += len(batch)
+        progress.results += len(results)
+        progress.report()
+
+    print("✓ ", end="")
+    progress.report(final=True)
+    for failure in progress.failed[:10]:
+        print(f"  ⚠ Skipped {failure}")
+    if len(progress.failed) > 10:
+        print(f"  ... and {len(progress.failed) - 10} more unreadable files or events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+"""
+In-process benchmark for the API hot paths.
+
+Drives the FastAPI app through an ASGI client (no server, no network) against
+an in-memory stand-in for the Supabase query chain, and reports p50/p95/p99
+latency and requests/sec per endpoint at increasing concurrency. Results are
+written as JSON so runs on different commits can be compared.
+
+Usage:
+    python scripts/benchmark_api.py --output bench.json
+    python scripts/benchmark_api.py --compare bench.json   # diff against an earlier run
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import itertools
+import threading
+import subprocess
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import httpx
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+# The app must not pick up real credentials or storage settings
+os.environ["SUPABASE_URL"] = ""
+os.environ["SUPABASE_KEY"] = ""
+os.environ["STORAGE_BACKEND"] = "supabase"
+
+from backend import main  # noqa: E402
+from db import PRIMARY_KEYS, SupabaseRepository, AsyncRepository  # noqa: E402  (backend/ is on sys.path once main is loaded)
+from metrics import InstrumentedClient  # noqa: E402
+
+
+# ==================== Fake Supabase ====================
+
+class FakeResponse:
+    def __init__(self, data: List[dict]):
+        self.data = data
+        self.count = len(data)
+
+
+# PostgREST `is` values and comparison operators
+IS_VALUES = {"null": None, "true": True, "false": False}
+OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+def row_filter(column: str, op: str, value):
+    """Row predicate for one filter; SQL semantics, so NULL matches only `is`"""
+    if op == "is":
+        expected = IS_VALUES[value.lower()] if isinstance(value, str) else value
+        return lambda row: row.get(column) is expected
+    test = OPERATORS[op]
+    return lambda row: row.get(column) is not None and test(row.get(column), value)
+
+
+def split_top_level(text: str) -> List[str]:
+    """Split a PostgREST logic list on commas outside parentheses and quotes"""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(text):
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ",":
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def parse_logic(kind: str, text: str):
+    """Row predicate for an `or=(...)` / `and(...)` filter string, e.g. from .or_()"""
+    tests = []
+    for part in split_top_level(text):
+        part = part.strip()
+        nested = part.split("(", 1)[0]
+        if nested in ("and", "or") and part.endswith(")"):
+            tests.append(parse_logic(nested, part[len(nested) + 1:-1]))
+            continue
+        column, op, value = part.split(".", 2)
+        tests.append(row_filter(column, op, value[1:-1] if value.startswith('"') else value))
+    combine = all if kind == "and" else any
+    return lambda row: combine(test(row) for test in tests)
+
+
+class FakeQuery:
+    """Supports the subset of the postgrest query builder the backend uses"""
+
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table = table
+        self.op = "select"
+        self.payload = None
+        self.on_conflict = None
+        self.filters = []
+        self.order_by = []
+        self.limit_to = None
+        self.offset = 0
+
+    def select(self, columns: str = "*", count: Optional[str] = None):
+        self.op = "select"
+        return self
+
+    def insert(self, payload):
+        self.op, self.payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self.op, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def upsert(self, payload, on_conflict: Optional[str] = None):
+        self.op, self.payload, self.on_conflict = "upsert", payload, on_conflict
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(row_filter(column, "gt", value))
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(row_filter(column, "gte", value))
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(row_filter(column, "lt", value))
+        return self
+
+    def is_(self, column, value):
+        self.filters.append(row_filter(column, "is", value))
+        return self
+
+    def or_(self, filters: str):
+        self.filters.append(parse_logic("or", filters))
+        return self
+
+    def order(self, column, desc: bool = False):
+        self.order_by.append((column, desc))
+        return self
+
+    def limit(self, count: int):
+        self.limit_to = count
+        return self
+
+    def range(self, start: int, end: int):
+        self.offset, self.limit_to = start, end - start + 1
+        return self
+
+    def execute(self) -> FakeResponse:
+        self.db.round_trip(self.table, self.op)
+        with self.db.lock:
+            rows = self.db.tables.setdefault(self.table, [])
+            if self.op == "select":
+                out = [row for row in rows if all(f(row) for f in self.filters)]
+                # Stable sorts, last key first, give a multi-column ORDER BY
+                for column, desc in reversed(self.order_by):
+                    out.sort(key=lambda r: r.get(column) or "", reverse=desc)
+                if self.limit_to:
+                    out = out[self.offset:self.offset + self.limit_to]
+                return FakeResponse([dict(r) for r in out])
+            if self.op == "delete":
+                kept = [row for row in rows if not all(f(row) for f in self.filters)]
+                out = [dict(row) for row in rows if all(f(row) for f in self.filters)]
+                rows[:] = kept
+                return FakeResponse(out)
+            if self.op == "update":
+                out = []
+                for row in rows:
+                    if all(f(row) for f in self.filters):
+                        row.update(self.payload)
+                        out.append(dict(row))
+                return FakeResponse(out)
+            return FakeResponse(self._write(rows))
+
+    def _write(self, rows: List[dict]) -> List[dict]:
+        payload = self.payload if isinstance(self.payload, list) else [self.payload]
+        pk = PRIMARY_KEYS[self.table]
+        keys = (self.on_conflict or pk).split(",")
+        out = []
+        for new in payload:
+            existing = None
+            if self.op == "upsert":
+                existing = next((r for r in rows if all(r.get(k) == new.get(k) for k in keys)), None)
+            if existing:
+                existing.update(new)
+                out.append(dict(existing))
+            else:
+                row = {pk: next(self.db.ids), **new}
+                rows.append(row)
+                out.append(dict(row))
+        return out
+
+
+class FakeRpc:
+    def __init__(self, db: "FakeSupabase", name: str, params: dict):
+        self.db, self.name, self.params = db, name, params
+
+    def execute(self) -> FakeResponse:
+        self.db.round_trip("rpc", self.name)
+        if self.name != "adjust_factor_weights":
+            raise Exception(f"Unknown function {self.name}")
+        ids = set(self.params["factor_ids"])
+        out = []
+        with self.db.lock:
+            for f in self.db.tables["factors"]:
+                if f["factor_id"] in ids:
+                    f["current_weight"] = round(min(f["max_weight"], max(f["min_weight"], f["current_weight"] + self.params["delta"])), 4)
+                    out.append({"factor_id": f["factor_id"], "current_weight": f["current_weight"]})
+        return FakeResponse(out)
+
+
+class FakeSupabase:
+    """
+    In-memory stand-in for the Supabase client's table().select().eq().execute() chain.
+
+    Every execute() sleeps for `latency_ms` to simulate a PostgREST round trip.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.lock = threading.Lock()
+        self.latency = latency_ms / 1000
+        self.tables: Dict[str, List[dict]] = {}
+        self.ids = itertools.count(1)
+        self.round_trips: Dict[str, int] = {}
+
+    def round_trip(self, table: str, op: str) -> None:
+        key = f"{table}.{op}"
+        self.round_trips[key] = self.round_trips.get(key, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: dict) -> FakeRpc:
+        return FakeRpc(self, name, params)
+
+
+def seed(fake: FakeSupabase, games: int) -> List[dict]:
+    """Fill the fake database with factors, games and a prediction per game"""
+    today = datetime.utcnow()
+    game_rows = [
+        {
+            "game_id": f"nba_bench_{i}",
+            "sport": "nba" if i % 2 else "nfl",
+            "team_a": f"Team {i}A",
+            "team_b": f"Team {i}B",
+            "scheduled_date": (today + timedelta(days=i % 7)).strftime("%Y-%m-%d"),
+            "result": None,
+        }
+        for i in range(games)
+    ]
+    fake.tables["games"] = [dict(g) for g in game_rows]
+    fake.tables["factors"] = [dict(f) for f in main.DEMO_FACTORS]
+    fake.tables["predictions"] = []
+    fake.tables["prediction_factor_contributions"] = []
+    for game in game_rows:
+        prediction_id = next(fake.ids)
+        fake.tables["predictions"].append({
+            "prediction_id": prediction_id,
+            "game_id": game["game_id"],
+            "predicted_outcome": game["team_a"],
+            "confidence": 55.0,
+            "weight_version": "seed",
+            "created_at": today.isoformat(),
+        })
+        fake.tables["prediction_factor_contributions"].extend(
+            {"id": next(fake.ids), "prediction_id": prediction_id, "factor_id": f["factor_id"], "contribution_value": 0.1}
+            for f in main.DEMO_FACTORS
+        )
+    fake.tables["results"] = []
+    return game_rows
+
+
+def install(fake: FakeSupabase, games: List[dict]) -> None:
+    """Point the app's repository and in-memory state at the fake"""
+    main.repository = SupabaseRepository(InstrumentedClient(fake))
+    main.db = AsyncRepository(main.repository)
+    main.game_store.replace_all(games)
+    main.factor_cache.invalidate()
+
+
+# ==================== Benchmark ====================
+
+def endpoint_requests(games: List[dict]):
+    """(name, request factory) pairs; factories take a sequence number"""
+    ids = [g["game_id"] for g in games]
+    return [
+        ("GET /predict/{game_id}", lambda n: ("GET", f"/predict/{ids[n % len(ids)]}", None)),
+        ("GET /games", lambda n: ("GET", "/games", None)),
+        ("GET /games?limit=50", lambda n: ("GET", "/games?limit=50", None)),
+        ("GET /games/status/{game_id}", lambda n: ("GET", f"/games/status/{ids[n % len(ids)]}", None)),
+        ("POST /log_result", lambda n: ("POST", "/log_result", {
+            "game_id": ids[n % len(ids)],
+            "actual_outcome": games[n % len(games)]["team_a"],
+        })),
+        ("GET /analytics", lambda n: ("GET", "/analytics", None)),
+    ]
+
+
+async def run_level(client: httpx.AsyncClient, make_request, concurrency: int, total: int) -> dict:
+    latencies = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while True:
+            n = next(counter)
+            if n >= total:
+                return
+            method, path, body = make_request(n)
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+    }
+
+
+async def run_benchmarks(args) -> dict:
+    fake = FakeSupabase(latency_ms=args.db_latency_ms)
+    games = seed(fake, args.games)
+    install(fake, games)
+
+    results = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, make_request in endpoint_requests(games):
+            if args.endpoints and not any(e in name for e in args.endpoints):
+                continue
+            await run_level(client, make_request, 1, args.warmup)
+            for concurrency in args.concurrency:
+                level = await run_level(client, make_request, concurrency, args.requests)
+                level["endpoint"] = name
+                results.append(level)
+                print(f"{name:30} c={concurrency:<4} {level['rps']:9.1f} req/s  "
+                      f"p50={level['p50_ms']:7.2f}ms  p95={level['p95_ms']:7.2f}ms  "
+                      f"p99={level['p99_ms']:7.2f}ms  errors={level['errors']}")
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {
+            "games": args.games,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "db_latency_ms": args.db_latency_ms,
+        },
+        "db_round_trips": fake.round_trips,
+        "results": results,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(previous: dict, current: dict) -> None:
+    """Print p95 and req/s changes against an earlier run"""
+    before = {(r["endpoint"], r["concurrency"]): r for r in previous["results"]}
+    print(f"\nCompared with {previous.get('commit')} ({previous.get('timestamp')}):")
+    for r in current["results"]:
+        old = before.get((r["endpoint"], r["concurrency"]))
+        if not old:
+            continue
+        rps_change = (r["rps"] - old["rps"]) / old["rps"] * 100 if old["rps"] else 0.0
+        p95_change = (r["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        print(f"{r['endpoint']:30} c={r['concurrency']:<4} req/s {rps_change:+6.1f}%  p95 {p95_change:+6.1f}%")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark API hot paths in-process")
+    parser.add_argument("--games", type=int, default=200, help="games to seed")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint and concurrency level")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="simulated PostgREST round trip")
+    parser.add_argument("--endpoints", nargs="*", help="only run endpoints containing these strings")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmarks(args))
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main_cli()
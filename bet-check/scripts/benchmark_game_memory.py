@@ -0,0 +1,120 @@
+"""
+Memory benchmark for the in-memory game table.
+
+Builds a synthetic season of games shaped like the ones ESPN ingest
+produces (lower-case sport, home/away team names and ids, ISO dates, live
+state and scores) and measures, with tracemalloc, the memory held by:
+
+- a list of game dicts (how games were held before GameRecord)
+- the same games as GameRecords
+- a full GameStore (records plus the sport/date/status indexes)
+
+It also times a status-filtered list() and a keyset page() on the store.
+
+Usage:
+    python scripts/benchmark_game_memory.py
+    python scripts/benchmark_game_memory.py --games 250000
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import os
+import sys
+import gc
+import time
+import random
+import argparse
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from game_store import GameRecord, GameStore, FINAL
+
+SPORTS = {"nba": 30, "nfl": 32, "mlb": 30, "nhl": 32}
+
+
+def synthetic_games(count: int, seed: int = 7) -> List[dict]:
+    """Games spread over a few seasons; about half have a result"""
+    rng = random.Random(seed)
+    first_day = date(2022, 10, 1)
+    games = []
+    for i in range(count):
+        sport = rng.choice(list(SPORTS))
+        teams = SPORTS[sport]
+        a, b = rng.sample(range(teams), 2)
+        day = first_day + timedelta(days=rng.randrange(3 * 365))
+        # Names are built per game, as parsing JSON would, so nothing is shared up front
+        game = {
+            "game_id": f"{sport}_{401000000 + i}",
+            "sport": sport,
+            "team_a": f"{sport.upper()} City {a}",
+            "team_b": f"{sport.upper()} City {b}",
+            "team_a_id": a,
+            "team_b_id": b,
+            "scheduled_date": day.isoformat(),
+            "start_time": f"{day.isoformat()}T00:30Z",
+            "scoreboard_date": day.strftime("%Y%m%d"),
+            "result": None,
+        }
+        if rng.random() < 0.5:
+            score_a, score_b = rng.randrange(80, 130), rng.randrange(80, 130)
+            game.update({
+                "state": "post",
+                "score_a": score_a,
+                "score_b": score_b,
+                "result": game["team_a"] if score_a >= score_b else game["team_b"],
+            })
+        else:
+            game["state"] = "pre"
+        games.append(game)
+    return games
+
+
+def measure(build: Callable[[], object]):
+    """(object, bytes still allocated once it is built)"""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return obj, used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory of dict vs GameRecord game tables")
+    parser.add_argument("--games", type=int, default=100_000)
+    args = parser.parse_args()
+
+    n = args.games
+    mb = 1024 * 1024
+    dicts, dict_bytes = measure(lambda: synthetic_games(n))
+    records, record_bytes = measure(lambda: [GameRecord(g) for g in synthetic_games(n)])
+    store, store_bytes = measure(lambda: GameStore(synthetic_games(n)))
+
+    # Same content back out
+    assert all(r.to_dict() == g for r, g in zip(records, dicts)), "round trip changed a game"
+    assert len(store) == n
+
+    print(f"{n} games")
+    print(f"  list of dicts:      {dict_bytes / mb:7.1f} MB  ({dict_bytes / n:5.0f} B/game)")
+    print(f"  list of GameRecord: {record_bytes / mb:7.1f} MB  ({record_bytes / n:5.0f} B/game)"
+          f"  {dict_bytes / record_bytes:.1f}x smaller")
+    print(f"  GameStore + indexes:{store_bytes / mb:7.1f} MB  ({store_bytes / n:5.0f} B/game)")
+
+    started = time.perf_counter()
+    finals = store.list(sport="nba", status=FINAL)
+    listed = time.perf_counter() - started
+    started = time.perf_counter()
+    page = store.page(sport="nba", date_from="2023-06-01", limit=100)
+    paged = time.perf_counter() - started
+    print(f"  list(nba, final): {len(finals)} games in {listed * 1000:.1f} ms")
+    print(f"  page(nba, from 2023-06-01, 100): {len(page)} games in {paged * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Collapse duplicate game rows onto the canonical game key.
+
+Older ingest paths keyed the same ESPN event three ways (`nba_{id}`,
+`nba_{id}_{YYYYMMDD}` and the bare id with an upper-case sport, away team
+first). This groups stored games by canonical key (`{sport}_{espn_id}`),
+writes one canonical row per group (home team first, lower-case sport,
+any known result) and moves predictions and results from the duplicates
+onto it before deleting them.
+
+Team names are not folded across spellings: the row keeps the preferred
+copy's names, and a result taken from another copy is mapped onto them
+only when it is the same name up to case and punctuation.
+
+Prints what it would do unless --apply is given.
+
+Usage:
+    python scripts/dedupe_games.py            # dry run
+    python scripts/dedupe_games.py --apply
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import os
+import sys
+import argparse
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from db import SupabaseRepository, get_supabase_client
+from sqlite_repository import SqliteRepository
+from teams import canonical_game_id, normalize
+
+load_dotenv()
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "betcheck.db")
+
+
+def get_repository():
+    if STORAGE_BACKEND == "sqlite":
+        return SqliteRepository(SQLITE_PATH)
+    return SupabaseRepository(get_supabase_client())
+
+
+def canonical_row(key: str, rows: List[dict]) -> dict:
+    """One row for a group, preferring the copy already in canonical form"""
+    def rank(row: dict) -> int:
+        if row["game_id"] == key:
+            return 0
+        return 2 if row["game_id"].isdigit() else 1
+
+    best = min(rows, key=rank)
+    sport = best["sport"].lower()
+    team_a, team_b = best["team_a"], best["team_b"]
+    if best["game_id"].isdigit():
+        # espn_fetcher.py stored the away team first
+        team_a, team_b = team_b, team_a
+    result = next((r["result"] for r in sorted(rows, key=rank) if r.get("result")), None)
+    if result:
+        result = next((team for team in (team_a, team_b) if normalize(team) == normalize(result)), result)
+    return {
+        "game_id": key,
+        "sport": sport,
+        "team_a": team_a,
+        "team_b": team_b,
+        "scheduled_date": str(best["scheduled_date"])[:10],
+        "result": result,
+    }
+
+
+def plan(repository, page_size: int = 1000) -> Tuple[List[dict], Dict[str, str], int, int]:
+    """
+    Returns:
+        rows: canonical rows to write (new or changed)
+        merges: {duplicate game_id: canonical game_id}
+        scanned: stored game rows read
+        games: distinct games once merged
+    """
+    groups: Dict[str, List[dict]] = {}
+    scanned = 0
+    for page in repository.scan("games", "game_id,sport,team_a,team_b,scheduled_date,result", page_size):
+        scanned += len(page)
+        for row in page:
+            groups.setdefault(canonical_game_id(row["game_id"], row["sport"]), []).append(row)
+
+    rows, merges = [], {}
+    for key, group in groups.items():
+        if len(group) == 1 and group[0]["game_id"] == key:
+            continue
+        rows.append(canonical_row(key, group))
+        merges.update({r["game_id"]: key for r in group if r["game_id"] != key})
+    return rows, merges, scanned, len(groups)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge duplicate game rows onto canonical game keys")
+    parser.add_argument("--apply", action="store_true", help="write the changes (default: dry run)")
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    repository = get_repository()
+    rows, merges, scanned, games = plan(repository, args.page_size)
+    print(f"Scanned {scanned} games: {len(rows)} canonical rows to write, {len(merges)} duplicates to merge")
+    for old, new in list(merges.items())[:10]:
+        print(f"  {old} -> {new}")
+    if len(merges) > 10:
+        print(f"  ... and {len(merges) - 10} more")
+
+    if not args.apply or not rows:
+        return
+    repository.upsert_games(rows)
+    repository.merge_games(merges)
+    print(f"✓ Merged {len(merges)} duplicates; {games} games remain")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,82 +5,64 @@ Updates games table in Supabase
 """
 
 import os
-import requests
+import sys
+import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict
-from supabase import create_client, Client
+from typing import List, Dict, Optional
+from supabase import create_client
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from espn_client import ESPNClient, SPORTS, parse_event
+from game_sync import sync_games, DEFAULT_CHUNK_SIZE
+
 load_dotenv()
 
 supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
 
-SPORTS = {
-    "nba": "basketball/nba",
-    "nfl": "football/nfl",
-    # add more later
-}
+SYNC_CHUNK_SIZE = int(os.getenv("SYNC_CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
 
-def fetch_games(sport: str = "nba", days_ahead: int = 5) -> List[Dict]:
-    base_url = "https://site.api.espn.com/apis/site/v2/sports/"
+async def fetch_all_games(sports: Optional[List[str]] = None, days_ahead: int = 5) -> List[Dict]:
+    """Fetch every sport concurrently over one pooled connection"""
+    sports = sports or list(SPORTS)
     today = datetime.utcnow().strftime("%Y%m%d")
     end_date = (datetime.utcnow() + timedelta(days=days_ahead)).strftime("%Y%m%d")
-    dates_param = f"dates={today}-{end_date}"
-
-    url = f"{base_url}{SPORTS[sport]}/scoreboard?{dates_param}"
-
-    try:
-        r = requests.get(url, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-
-        games = []
-        for event in data.get("events", []):
-            comp = event["competitions"][0]
-            teams = comp["competitors"]
-
-            # Determine home/away
-            home = next(t for t in teams if t["homeAway"] == "home")
-            away = next(t for t in teams if t["homeAway"] == "away")
-
-            game = {
-                "game_id": event["id"],
-                "sport": sport.upper(),
-                "team_a": f"{away['team']['location']} {away['team']['name']}".strip(),  # away first
-                "team_b": f"{home['team']['location']} {home['team']['name']}".strip(),  # home second
-                "scheduled_date": event["date"],  # ISO UTC
-                "result": None,
-            }
-
-            # If game completed, set winner
-            if comp["status"]["type"]["completed"]:
-                winner = next((t["team"]["displayName"] for t in teams if t.get("winner")), None)
-                game["result"] = winner
 
+    async with ESPNClient() as client:
+        events = await client.fetch_events(sports, [f"{today}-{end_date}"])
+        summary = client.timing_summary()
+
+    # Same game keys, team names and home/away order as the API and update_games.py
+    games = []
+    for sport, _, event in events:
+        try:
+            game = parse_event(event, sport)
+        except Exception as e:
+            print(f"Skipping event {event.get('id')} ({sport}): {e}")
+            continue
+        if game:
             games.append(game)
 
-        print(f"Fetched {len(games)} {sport.upper()} games")
-        return games
+    for sport in sports:
+        print(f"Fetched {sum(1 for g in games if g['sport'] == sport)} {sport.upper()} games")
+    print(f"{summary['requests']} requests, slowest {summary['max_ms']}ms, {summary['failures']} failed")
+    return games
 
-    except Exception as e:
-        print(f"ESPN fetch failed ({sport}): {str(e)}")
-        return []
+
+def fetch_games(sport: str = "nba", days_ahead: int = 5) -> List[Dict]:
+    return asyncio.run(fetch_all_games([sport], days_ahead))
 
 
 def upsert_games(games: List[Dict]):
     if not games:
         return
-    success = 0
-    for g in games:
-        try:
-            supabase.table("games").upsert(g, on_conflict="game_id").execute()
-            success += 1
-        except Exception as e:
-            print(f"Upsert failed {g['team_a']} vs {g['team_b']}: {e}")
-    print(f"Updated {success}/{len(games)} games")
+    stats = sync_games(supabase, games, chunk_size=SYNC_CHUNK_SIZE)
+    print(f"Synced {len(games)} games in {stats['elapsed_seconds']}s: "
+          f"{stats['inserted']} inserted, {stats['updated']} updated, "
+          f"{stats['unchanged']} unchanged, {stats['failed']} failed")
 
 
 if __name__ == "__main__":
-    games = fetch_games("nba")
+    games = asyncio.run(fetch_all_games())
     upsert_games(games)
 
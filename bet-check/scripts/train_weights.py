@@ -0,0 +1,276 @@
+"""
+Offline factor weight trainer.
+
+Loads every verified prediction with its factor contributions in bulk and
+fits factor weights over the whole history with a vectorized logistic
+regression (projected batch gradient descent, so each weight stays within
+its factor's min_weight/max_weight). The fitted weights are written back in
+one operation. Use it to rebuild weights after a rule change instead of
+replaying results through /log_result one at a time.
+
+Usage:
+    python scripts/train_weights.py                 # fit and write weights
+    python scripts/train_weights.py --dry-run       # fit and print only
+    python scripts/train_weights.py --synthetic 200000 --dry-run   # timing and recovery check
+
+Uses STORAGE_BACKEND / SQLITE_PATH / SUPABASE_* like the API.
+
+Copyright (c) 2025 Jmenichole
+Licensed under MIT License
+https://jmenichole.github.io/Portfolio/
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import Dict, List, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from db import SupabaseRepository, get_supabase_client
+from sqlite_repository import SqliteRepository
+
+load_dotenv()
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "betcheck.db")
+
+
+def get_repository():
+    if STORAGE_BACKEND == "sqlite":
+        return SqliteRepository(SQLITE_PATH)
+    return SupabaseRepository(get_supabase_client())
+
+
+# ==================== Loading ====================
+
+def load_history(
+    repository, default_weights: Dict[int, float], page_size: int = 1000
+) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+    """
+    Build the training set from scored predictions.
+
+    A stored contribution is the factor's input difference times the weight
+    in effect when the prediction was made, so it is divided by that weight
+    (recorded as factor_weight) to recover the input difference; fitting on
+    the weighted value would give a multiplier on the old weight instead of
+    a weight. Rows saved before factor_weight was recorded fall back to
+    `default_weights` (the factors' base weights).
+
+    Returns:
+        X: (predictions x factors) input differences; a positive value means
+           the factor favored the predicted team
+        y: 1.0 where the prediction was correct, else 0.0
+        factor_ids: column order of X
+    """
+    # Label each scored prediction, falling back to the logged result when
+    # was_correct was never set on the prediction row
+    outcomes: Dict[str, str] = {}
+    for page in repository.scan("results", "result_id,game_id,actual_outcome", page_size):
+        for r in page:
+            outcomes[r["game_id"]] = r["actual_outcome"]  # ordered by id, so latest wins
+
+    labels: Dict[int, float] = {}
+    for page in repository.scan("predictions", "prediction_id,game_id,predicted_outcome,was_correct", page_size):
+        for p in page:
+            if p.get("was_correct") is not None:
+                labels[p["prediction_id"]] = float(bool(p["was_correct"]))
+            elif p["game_id"] in outcomes:
+                labels[p["prediction_id"]] = float(p["predicted_outcome"] == outcomes[p["game_id"]])
+
+    prediction_ids, factor_ids, values, weights = [], [], [], []
+    legacy = 0
+    columns = "id,prediction_id,factor_id,contribution_value,factor_weight"
+    for page in repository.scan("prediction_factor_contributions", columns, page_size):
+        for r in page:
+            weight = r.get("factor_weight")
+            if weight is None:
+                legacy += 1
+                weight = default_weights.get(r["factor_id"], 0.0)
+            prediction_ids.append(r["prediction_id"])
+            factor_ids.append(r["factor_id"])
+            values.append(float(r["contribution_value"]))
+            weights.append(float(weight))
+    if legacy:
+        print(f"⚠️  {legacy} contributions have no recorded weight; using base weights for them")
+
+    values = np.asarray(values, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    inputs = np.zeros_like(values)
+    np.divide(values, weights, out=inputs, where=weights > 0)
+    return build_matrix(
+        np.asarray(prediction_ids, dtype=np.int64),
+        np.asarray(factor_ids, dtype=np.int64),
+        inputs,
+        labels
+    )
+
+
+def build_matrix(
+    prediction_ids: np.ndarray,
+    factor_ids: np.ndarray,
+    values: np.ndarray,
+    labels: Dict[int, float]
+) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+    """Pivot (prediction, factor, value) triples into a dense matrix of labelled rows"""
+    labelled = np.fromiter(labels.keys(), dtype=np.int64, count=len(labels))
+    y_all = np.fromiter(labels.values(), dtype=np.float64, count=len(labels))
+    order = np.argsort(labelled)
+    labelled, y_all = labelled[order], y_all[order]
+
+    keep = np.isin(prediction_ids, labelled)
+    prediction_ids, factor_ids, values = prediction_ids[keep], factor_ids[keep], values[keep]
+
+    columns, col = np.unique(factor_ids, return_inverse=True)
+    rows_used, row = np.unique(prediction_ids, return_inverse=True)
+
+    X = np.zeros((len(rows_used), len(columns)))
+    X[row, col] = values  # duplicate (prediction, factor) rows: last one wins
+    y = y_all[np.searchsorted(labelled, rows_used)]
+    return X, y, columns.tolist()
+
+
+# ==================== Fitting ====================
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35, 35)))
+
+
+def log_loss(X: np.ndarray, y: np.ndarray, w: np.ndarray, bias: float) -> float:
+    p = _sigmoid(X @ w + bias)
+    eps = 1e-12
+    return float(-np.mean(y * np.log(p + eps) + (1 - y) * np.log(1 - p + eps)))
+
+
+def fit_weights(
+    X: np.ndarray,
+    y: np.ndarray,
+    initial: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    learning_rate: float = 0.5,
+    l2: float = 0.01,
+    iterations: int = 2000,
+    tolerance: float = 1e-7
+) -> Tuple[np.ndarray, float, int]:
+    """
+    Fit P(correct) = sigmoid(X @ w + b) by full-batch projected gradient descent.
+
+    Each step is a couple of matrix-vector products over the whole history.
+    After every step w is clipped to [lower, upper]; the L2 term pulls w
+    toward `initial` so factors with little evidence keep their weight.
+
+    Returns:
+        (weights, bias, iterations run)
+    """
+    n = max(len(y), 1)
+    # Scale features so one learning rate suits any contribution magnitude
+    scale = np.abs(X).max(axis=0)
+    scale[scale == 0] = 1.0
+    Xs = X / scale
+
+    w = np.clip(initial, lower, upper) * scale
+    lo, hi, prior = lower * scale, upper * scale, initial * scale
+    bias = 0.0
+    for step in range(1, iterations + 1):
+        error = _sigmoid(Xs @ w + bias) - y
+        grad_w = Xs.T @ error / n + l2 * (w - prior)
+        grad_b = error.mean()
+        new_w = np.clip(w - learning_rate * grad_w, lo, hi)
+        bias -= learning_rate * grad_b
+        converged = np.max(np.abs(new_w - w)) < tolerance and abs(grad_b) < tolerance
+        w = new_w
+        if converged:
+            break
+    return w / scale, bias, step
+
+
+# ==================== Synthetic data ====================
+
+def synthetic_history(
+    count: int,
+    factors: List[dict],
+    seed: int = 7
+) -> Tuple[np.ndarray, np.ndarray, List[int], np.ndarray]:
+    """
+    Random input differences with outcomes drawn from hidden 'true' weights
+    inside each factor's bounds. Also returns the true weights.
+    """
+    rng = np.random.default_rng(seed)
+    # Inputs are 0-1 ratings, so home/away differences mostly fall in [-1, 1]
+    X = np.clip(rng.normal(0.0, 0.4, size=(count, len(factors))), -1.0, 1.0)
+    true_w = np.array([rng.uniform(float(f["min_weight"]), float(f["max_weight"])) for f in factors])
+    y = (rng.random(count) < _sigmoid(X @ true_w)).astype(np.float64)
+    return X, y, [f["factor_id"] for f in factors], true_w
+
+
+# ==================== Main ====================
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit factor weights over the full result history")
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--l2", type=float, default=0.01, help="pull toward current weights")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="print the fit without writing weights")
+    parser.add_argument("--synthetic", type=int, help="train on N generated rows instead of the database")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        repository = None
+        factors = [
+            {"factor_id": i, "name": f"Factor {i}", "current_weight": 0.2, "min_weight": 0.05, "max_weight": 0.5}
+            for i in range(1, 6)
+        ]
+    else:
+        repository = get_repository()
+        factors = repository.list_factors()
+    by_id = {f["factor_id"]: f for f in factors}
+
+    started = time.perf_counter()
+    true_weights = None
+    if args.synthetic:
+        X, y, factor_ids, true_weights = synthetic_history(args.synthetic, factors)
+    else:
+        base_weights = {f["factor_id"]: float(f["base_weight"]) for f in factors}
+        X, y, factor_ids = load_history(repository, base_weights, args.page_size)
+    loaded = time.perf_counter()
+
+    known = [i for i, fid in enumerate(factor_ids) if fid in by_id]
+    X, factor_ids = X[:, known], [factor_ids[i] for i in known]
+    if not len(y) or not factor_ids:
+        print("⚠️  No scored predictions with factor contributions to train on")
+        return
+
+    initial = np.array([float(by_id[fid]["current_weight"]) for fid in factor_ids])
+    lower = np.array([float(by_id[fid]["min_weight"]) for fid in factor_ids])
+    upper = np.array([float(by_id[fid]["max_weight"]) for fid in factor_ids])
+
+    weights, bias, steps = fit_weights(
+        X, y, initial, lower, upper,
+        learning_rate=args.learning_rate, l2=args.l2, iterations=args.iterations
+    )
+    fitted = time.perf_counter()
+
+    print(f"📊 {len(y)} scored predictions x {len(factor_ids)} factors "
+          f"({y.mean() * 100:.1f}% correct)")
+    print(f"   load {loaded - started:.2f}s, fit {fitted - loaded:.2f}s ({steps} iterations)")
+    print(f"   log loss {log_loss(X, y, initial, 0.0):.4f} -> {log_loss(X, y, weights, bias):.4f}")
+    for i, (fid, old, new) in enumerate(zip(factor_ids, initial, weights)):
+        truth = f"  (true {true_weights[i]:.4f})" if true_weights is not None else ""
+        print(f"   {by_id[fid]['name']:24} {old:.4f} -> {new:.4f}{truth}")
+
+    new_weights = {fid: round(float(w), 4) for fid, w in zip(factor_ids, weights)}
+    if args.dry_run or repository is None:
+        print("Dry run - weights not written")
+        return
+    repository.set_factor_weights(new_weights)
+    print(f"✓ Updated {len(new_weights)} factor weights "
+          f"(running API picks them up within FACTOR_CACHE_TTL)")
+
+
+if __name__ == "__main__":
+    main()
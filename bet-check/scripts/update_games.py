@@ -8,18 +8,20 @@ https://jmenichole.github.io/Portfolio/
 """
 
 import os
-import requests
-from datetime import datetime, timedelta
+import sys
+import asyncio
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+from espn_client import ESPNClient
+from game_sync import sync_games, DEFAULT_CHUNK_SIZE
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-# ESPN API (free, no key required)
-ESPN_NBA_API = "http://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
+SYNC_CHUNK_SIZE = int(os.getenv("SYNC_CHUNK_SIZE", DEFAULT_CHUNK_SIZE))
 
 supabase: Client = None
 try:
@@ -31,52 +33,19 @@ except Exception as e:
 def fetch_nba_games_from_espn():
     """
     Fetch current and upcoming NBA games from ESPN API.
-    Returns games for today and next 7 days.
+    Returns games for today and next 7 days (all dates fetched concurrently).
     """
+    return asyncio.run(_fetch_nba_games())
+
+async def _fetch_nba_games():
     try:
-        all_games = []
-        
-        # Fetch games for today and next 7 days
-        for days_ahead in range(8):
-            target_date = datetime.now() + timedelta(days=days_ahead)
-            date_str = target_date.strftime("%Y%m%d")
-            
-            url = f"{ESPN_NBA_API}?dates={date_str}"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                events = data.get("events", [])
-                
-                for event in events:
-                    try:
-                        competitions = event.get("competitions", [{}])[0]
-                        competitors = competitions.get("competitors", [])
-                        
-                        if len(competitors) >= 2:
-                            # Home team is usually index 0, away is index 1
-                            home_team = competitors[0].get("team", {}).get("displayName", "Unknown")
-                            away_team = competitors[1].get("team", {}).get("displayName", "Unknown")
-                            
-                            game_id = f"nba_{event.get('id', '')}_{date_str}"
-                            scheduled = event.get("date", target_date.isoformat())
-                            
-                            all_games.append({
-                                "game_id": game_id,
-                                "sport": "nba",
-                                "team_a": home_team,
-                                "team_b": away_team,
-                                "scheduled_date": scheduled[:10],  # YYYY-MM-DD format
-                                "result": None
-                            })
-                    except Exception as e:
-                        print(f"  Warning: Could not parse event: {e}")
-                        continue
-                        
-                print(f"✓ Fetched {len(events)} games for {target_date.strftime('%Y-%m-%d')}")
-            else:
-                print(f"⚠ ESPN API returned {response.status_code} for {date_str}")
+        # Fetch games for today and next 7 days, parsed by the shared ingest path
+        async with ESPNClient() as client:
+            all_games = await client.fetch_games(["nba"], days_ahead=8)
+            summary = client.timing_summary()
         
+        print(f"✓ Fetched {len(all_games)} games in {summary['requests']} requests "
+              f"(slowest {summary['max_ms']}ms, {summary['failures']} failed)")
         return all_games
     
     except Exception as e:
@@ -103,16 +72,12 @@ def update_games():
                 print(f"  ... and {len(games) - 10} more")
             return
         
-        # Upsert games into database
-        success_count = 0
-        for game in games:
-            try:
-                response = supabase.table("games").upsert(game).execute()
-                success_count += 1
-            except Exception as e:
-                print(f"  ✗ Failed to upsert {game['team_a']} vs {game['team_b']}: {e}")
+        # Bulk upsert only new or changed games
+        stats = sync_games(supabase, games, chunk_size=SYNC_CHUNK_SIZE)
         
-        print(f"\n✓ Successfully updated {success_count}/{len(games)} games!")
+        print(f"\n✓ Synced {len(games)} games in {stats['elapsed_seconds']}s: "
+              f"{stats['inserted']} inserted, {stats['updated']} updated, "
+              f"{stats['unchanged']} unchanged, {stats['failed']} failed")
         
     except Exception as e:
         print(f"✗ Error updating games: {str(e)}")
@@ -2,8 +2,13 @@
 Example API usage and testing
 """
 
+import os
+import sys
 import requests
 import json
+import time
+import asyncio
+import httpx
 
 API_BASE = "http://localhost:8000"
 
@@ -67,6 +72,195 @@ def test_get_analytics():
     print(json.dumps(response.json(), indent=2))
     print()
 
+def test_concurrency(levels=(1, 4, 16), requests_per_level: int = 64, db_latency_ms: float = 10.0):
+    """
+    Test that throughput scales with in-flight requests.
+
+    Drives the app in-process (no server needed) against the benchmark's
+    fake Supabase, where every query sleeps like a network round trip.
+    Handlers offload those calls to a thread pool, so req/s at 16 in flight
+    must be several times req/s at 1 instead of staying flat (serialized).
+    Every request must succeed and return the same prediction, and reads
+    must not move factor weights.
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+    import benchmark_api
+
+    fake = benchmark_api.FakeSupabase(latency_ms=db_latency_ms)
+    games = benchmark_api.seed(fake, 1)
+    benchmark_api.install(fake, games)
+    app = benchmark_api.main.app
+    game_id = games[0]["game_id"]
+    print(f"Testing concurrency on /predict/{game_id} ({db_latency_ms:.0f}ms per query)...")
+    weights_before = {f["factor_id"]: f["current_weight"] for f in fake.tables["factors"]}
+
+    async def run_level(concurrency: int):
+        semaphore = asyncio.Semaphore(concurrency)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+            async def one():
+                async with semaphore:
+                    return await client.get(f"/predict/{game_id}")
+
+            # Unmeasured request so the prediction is memoized and queued before timing
+            await one()
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(one() for _ in range(requests_per_level)))
+            rps = requests_per_level / (time.perf_counter() - started)
+        # Stop the background writer before this event loop closes
+        await benchmark_api.main.prediction_writer.close()
+        return responses, rps
+
+    throughput = {}
+    predictions = []
+    for concurrency in levels:
+        responses, rps = asyncio.run(run_level(concurrency))
+        statuses = sorted({r.status_code for r in responses})
+        assert statuses == [200], f"in-flight={concurrency}: got statuses {statuses}"
+        predictions.extend(r.json() for r in responses)
+        throughput[concurrency] = rps
+        print(f"  in-flight={concurrency:3d}  {rps:8.1f} req/s  ({rps / throughput[levels[0]]:.1f}x)")
+
+    assert all(p == predictions[0] for p in predictions), "concurrent requests returned different predictions"
+    weights_after = {f["factor_id"]: f["current_weight"] for f in fake.tables["factors"]}
+    assert weights_after == weights_before, "predictions changed factor weights"
+    speedup = throughput[levels[-1]] / throughput[levels[0]]
+    assert speedup >= 4, f"req/s at {levels[-1]} in flight is only {speedup:.1f}x req/s at {levels[0]}"
+    print(f"  ✓ {len(predictions)} responses, all 200 and identical; weights unchanged; {speedup:.1f}x at {levels[-1]} in flight")
+    print()
+
+def test_verify_logged_result():
+    """
+    Test verifying a result that was already logged.
+
+    A result from /log_result or from the live poller is queued for learning
+    when it is logged; /verify_result must report that event, not queue a
+    second one. Runs in-process against the benchmark's fake Supabase.
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+    import benchmark_api
+
+    fake = benchmark_api.FakeSupabase()
+    games = benchmark_api.seed(fake, 2)
+    benchmark_api.install(fake, games)
+    main = benchmark_api.main
+    print("Testing /verify_result after /log_result and after a poller result...")
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+            manual, polled = games
+            logged = await client.post("/log_result", json={
+                "game_id": manual["game_id"], "actual_outcome": manual["team_a"]
+            })
+            assert logged.status_code == 200, logged.text
+            # The poller's result path, as called when a game goes final
+            await main.live_poller.on_completed(polled["game_id"], polled["team_b"])
+            logged_events = {
+                manual["game_id"]: logged.json()["learning_event_id"],
+                polled["game_id"]: main.game_store.get(polled["game_id"])["learning_event_id"],
+            }
+
+            submitted = sum(main.learning_queue.stats()[k] for k in ("queued", "applied", "skipped", "failed"))
+            for game_id, event_id in logged_events.items():
+                verified = await client.post(f"/verify_result/{game_id}", params={"is_correct": "true"})
+                assert verified.status_code == 200, verified.text
+                assert verified.json()["learning_event_id"] == event_id, f"{game_id}: verify queued a new learning event"
+            after = sum(main.learning_queue.stats()[k] for k in ("queued", "applied", "skipped", "failed"))
+            assert after == submitted, f"verify_result queued {after - submitted} extra learning events"
+
+        await main.learning_queue.close()
+        await main.prediction_writer.close()
+
+    asyncio.run(run())
+    print("  ✓ verify_result reused the logged learning events")
+    print()
+
+def test_poller_retries_unlogged_final():
+    """
+    Test that the live poller keeps a final game until its result is logged.
+
+    ESPN first reports the game completed without a winner flag, then with
+    one while auto-logging fails; both polls must leave the game polled, the
+    next one logs it, and /verify_result then reuses that learning event.
+    Runs in-process against a mocked scoreboard and the benchmark's fake Supabase.
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+    import benchmark_api
+    from datetime import datetime, timedelta, timezone
+    from espn_client import ESPNClient, parse_event
+    from live_poller import LiveScorePoller
+
+    main = benchmark_api.main
+    start = datetime(2025, 1, 15, 23, 0, tzinfo=timezone.utc)
+    scoreboard = {"state": "pre", "winner": False}
+
+    def event():
+        done = scoreboard["state"] == "post"
+        return {
+            "id": "401999001",
+            "date": start.strftime("%Y-%m-%dT%H:%MZ"),
+            "competitions": [{
+                "competitors": [
+                    {"homeAway": "home", "team": {"displayName": "Retry Home"}, "score": "101" if done else None,
+                     "winner": scoreboard["winner"]},
+                    {"homeAway": "away", "team": {"displayName": "Retry Away"}, "score": "99" if done else None,
+                     "winner": False},
+                ],
+                "status": {"type": {"state": scoreboard["state"], "completed": done}},
+            }],
+        }
+
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"events": [event()]}))
+    game = parse_event(event(), "nba")
+    fake = benchmark_api.FakeSupabase()
+    benchmark_api.seed(fake, 0)
+    fake.tables["games"].append({k: game[k] for k in ("game_id", "sport", "team_a", "team_b", "scheduled_date", "result")})
+    benchmark_api.install(fake, [game])
+    print("Testing that an unlogged final is retried...")
+
+    attempts = []
+
+    async def on_completed(game_id: str, winner: str):
+        attempts.append(winner)
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+        return await main.record_result(game_id, winner, "auto", verified=False)
+
+    async def run():
+        poller = LiveScorePoller(
+            main.game_store, on_completed,
+            client_factory=lambda: ESPNClient(transport=transport),
+            now=lambda: start + timedelta(hours=3)
+        )
+        scoreboard["state"] = "post"
+        await poller.poll_once()
+        assert attempts == [], "logged a final without a winner"
+        assert poller.candidates(poller.now()), "final without a winner was dropped from polling"
+
+        scoreboard["winner"] = True
+        await poller.poll_once()
+        assert attempts == ["Retry Home"] and poller.completed == 0
+        assert poller.candidates(poller.now()), "final whose auto-logging failed was dropped from polling"
+
+        await poller.poll_once()
+        assert attempts == ["Retry Home"] * 2 and poller.completed == 1, "final was not retried"
+        assert not poller.candidates(poller.now()), "logged final is still polled"
+        await poller.close()
+
+        event_id = main.game_store.get(game["game_id"])["learning_event_id"]
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            verified = await client.post(f"/verify_result/{game['game_id']}", params={"is_correct": "true"})
+        assert verified.status_code == 200, verified.text
+        assert verified.json()["learning_event_id"] == event_id, "verify queued a new learning event"
+
+        await main.learning_queue.close()
+        await main.prediction_writer.close()
+
+    asyncio.run(run())
+    print("  ✓ final retried until logged; verify_result reused its learning event")
+    print()
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Bet Check - API Testing")
@@ -79,6 +273,9 @@ if __name__ == "__main__":
         test_get_factors()
         test_get_games()
         test_get_analytics()
+        test_concurrency()
+        test_verify_logged_result()
+        test_poller_retries_unlogged_final()
 
         # Get first game and test prediction
         games_response = requests.get(f"{API_BASE}/games?sport=nba")
@@ -96,5 +293,7 @@ if __name__ == "__main__":
     except requests.exceptions.ConnectionError:
         print("❌ Could not connect to API")
         print("Make sure the backend is running: python backend/main.py")
+        raise SystemExit(1)
     except Exception as e:
         print(f"❌ Error: {str(e)}")
+        raise SystemExit(1)